@@ -1,5 +1,9 @@
+import os
+import re
 from dataclasses import dataclass
-from typing import List, Dict, Any, Optional
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Set, Mapping, Tuple
 from pathlib import Path
 
 
@@ -11,6 +15,7 @@ class ModelConfig:
     temperature: float = 0.3
     top_p: float = 0.9
     num_predict: int = 300
+    ollama_host: Optional[str] = None  # None: OLLAMA_HOST or http://localhost:11434
 
 @dataclass
 class VectorStoreConfig:
@@ -19,6 +24,8 @@ class VectorStoreConfig:
     chunk_size: int = 500
     overlap: int = 50
     collection_prefix: str = "pizzeria"
+    # Save cached answers between sessions; off by default since questions and answers are stored in plain text
+    persist_answer_cache: bool = False
 
 @dataclass
 class DocumentConfig:
@@ -29,6 +36,60 @@ class DocumentConfig:
     description: str
     language: str = "fr"
     content_type: str = "menu"
+    company_name: str = ""
+
+# Keywords used to detect each allergen in ingredients (built once, shared read-only)
+_ALLERGEN_KEYWORDS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "Gluten": ("gluten", "blé", "froment", "épeautre", "kamut", "seigle", "orge", "avoine", "farine"),
+    "Crustacés": ("crustacés", "crustacé", "crevette", "homard", "crabe", "langoustine", "écrevisse"),
+    "Oeufs": ("oeuf", "œuf", "oeufs", "œufs", "albumine", "lecithine d'oeuf"),
+    "Poissons": ("poisson", "poissons", "anchois", "thon", "saumon", "sardine", "colin", "cabillaud"),
+    "Arachides": ("arachide", "arachides", "cacahuète", "cacahouète", "beurre de cacahuète"),
+    "Soja": ("soja", "sauce soja", "lecithine de soja", "protéine de soja"),
+    "Lait": ("lait", "crème", "beurre", "fromage", "yaourt", "lactose", "caséine", "lactosérum"),
+    "Fruits à coque": ("fruits à coque", "amande", "noisette", "noix", "pistache", "cajou", "pécan", "macadamia", "pignon"),
+    "Céleri": ("céleri", "céleri-rave"),
+    "Moutarde": ("moutarde", "graines de moutarde"),
+    "Sésame": ("sésame", "graines de sésame", "huile de sésame", "tahini"),
+    "Sulfites": ("sulfite", "sulfites", "anhydride sulfureux", "E220", "E221", "E222", "E223", "E224", "E225", "E226", "E227", "E228"),
+    "Lupin": ("lupin", "farine de lupin"),
+    "Mollusques": ("mollusque", "mollusques", "escargot", "huître", "moule", "coquille saint-jacques", "calmar", "poulpe")
+})
+
+# Filename normalization: separators become spaces for display names, underscores for internal names.
+# Each character is mapped on its own (runs are not collapsed) so names, and the collections and
+# processed files derived from them, stay the same as before
+_CLEAN_NAME_TABLE = str.maketrans('-_', '  ')
+_DOC_NAME_TABLE = str.maketrans('- ', '__')
+
+# Marks the end of a keyword inside a trie node
+_TRIE_END = ""
+
+
+def _build_trie(words) -> Dict[str, Any]:
+    """Builds a character trie (nested dicts) from the given words"""
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_TRIE_END] = {}
+    return trie
+
+
+def _trie_to_regex(node: Dict[str, Any]) -> str:
+    """
+    Converts a character trie into an equivalent prefix-factored regular expression.
+    When a keyword is a prefix of a longer one, the shorter keyword is preferred (lazy `??`).
+    """
+    branches = [re.escape(char) + _trie_to_regex(child)
+                for char, child in sorted(node.items()) if char != _TRIE_END]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if _TRIE_END in node:
+        return "(?:" + body + ")??"
+    return body
 
 @dataclass
 class AllergenConfig:
@@ -53,25 +114,41 @@ class AllergenConfig:
                 "Lupin",
                 "Mollusques"
             ]
+        self._compile_keyword_matcher()
+    
+    def _compile_keyword_matcher(self):
+        """
+        Compiles every allergen keyword into a single regular expression so text can be scanned in one pass.
+        The keywords are inserted into a trie first, so shared prefixes ("crustacé"/"crustacés", "e22x", ...)
+        are matched once; the pattern sits inside a lookahead so overlapping matches are all reported.
+        """
+        self._keyword_to_allergen: Dict[str, str] = {}
+        for allergen, keywords in self.get_allergen_keywords().items():
+            for keyword in keywords:
+                self._keyword_to_allergen.setdefault(keyword.lower(), allergen)
+        
+        trie = _build_trie(self._keyword_to_allergen)
+        self._keyword_pattern = re.compile("(?=(" + _trie_to_regex(trie) + "))")
+    
+    def detect(self, text: str) -> Set[str]:
+        """
+        Detects the allergens whose keywords appear in the given text.
+        Scans the lowercased text once with the precompiled keyword matcher.
+
+        Args:
+            text (str): The text to analyze for allergen keywords.
+
+        Returns:
+            Set[str]: The names of the allergens detected in the text.
+        """
+        if not text:
+            return set()
+        return {self._keyword_to_allergen[match.group(1)]
+                for match in self._keyword_pattern.finditer(text.lower())}
     
-    def get_allergen_keywords(self) -> Dict[str, List[str]]:
+    def get_allergen_keywords(self) -> Mapping[str, Tuple[str, ...]]:
         """Get keywords to detect each allergen in ingredients"""
-        return {
-            "Gluten": ["gluten", "blé", "froment", "épeautre", "kamut", "seigle", "orge", "avoine", "farine"],
-            "Crustacés": ["crustacés", "crustacé", "crevette", "homard", "crabe", "langoustine", "écrevisse"],
-            "Oeufs": ["oeuf", "œuf", "oeufs", "œufs", "albumine", "lecithine d'oeuf"],
-            "Poissons": ["poisson", "poissons", "anchois", "thon", "saumon", "sardine", "colin", "cabillaud"],
-            "Arachides": ["arachide", "arachides", "cacahuète", "cacahouète", "beurre de cacahuète"],
-            "Soja": ["soja", "sauce soja", "lecithine de soja", "protéine de soja"],
-            "Lait": ["lait", "crème", "beurre", "fromage", "yaourt", "lactose", "caséine", "lactosérum"],
-            "Fruits à coque": ["fruits à coque", "amande", "noisette", "noix", "pistache", "cajou", "pécan", "macadamia", "pignon"],
-            "Céleri": ["céleri", "céleri-rave"],
-            "Moutarde": ["moutarde", "graines de moutarde"],
-            "Sésame": ["sésame", "graines de sésame", "huile de sésame", "tahini"],
-            "Sulfites": ["sulfite", "sulfites", "anhydride sulfureux", "E220", "E221", "E222", "E223", "E224", "E225", "E226", "E227", "E228"],
-            "Lupin": ["lupin", "farine de lupin"],
-            "Mollusques": ["mollusque", "mollusques", "escargot", "huître", "moule", "coquille saint-jacques", "calmar", "poulpe"]
-        }
+        return _ALLERGEN_KEYWORDS
 
 class ModularConfig:
     """Main configuration class for the modular RAG system"""
@@ -88,61 +165,104 @@ class ModularConfig:
         self.processed_path = self.base_path / "data" / "processed"
         self.logs_path = self.base_path / "logs"
         
+        # Name -> DocumentConfig index for O(1) lookups
+        self._documents_by_name: Dict[str, DocumentConfig] = {}
+        
         # Create directories
         self._create_directories()
         
         # Initialize documents (after paths are set)
         self.documents = self._init_documents()
     
-    def _init_documents(self) -> List[DocumentConfig]:
+    def _init_documents(self, announce: bool = True) -> List[DocumentConfig]:
         """
         Initializes the list of document configurations by scanning the raw_pdfs directory for PDF files.
         Returns a list of DocumentConfig objects for each discovered PDF, creating names and descriptions automatically.
 
+        Args:
+            announce (bool, optional): Print the discovered documents. Defaults to True.
+
         Returns:
             List[DocumentConfig]: A list of configuration objects for all discovered documents.
         """
         documents = []
         
-        # Create the raw_pdfs directory if it doesn't exist
-        self.raw_pdfs_path.mkdir(parents=True, exist_ok=True)
+        # The raw_pdfs directory is guaranteed by _create_directories(), which runs first
         
-        # Find all PDF files in the raw_pdfs directory
-        pdf_files = list(self.raw_pdfs_path.glob("*.pdf")) + list(self.raw_pdfs_path.glob("*.PDF"))
+        # Find all PDF files in the raw_pdfs directory (single pass, case-insensitive extension),
+        # sorted so discovery order is stable across filesystems
+        with os.scandir(self.raw_pdfs_path) as entries:
+            pdf_files = sorted((entry for entry in entries
+                                if entry.is_file() and entry.name.lower().endswith('.pdf')),
+                               key=lambda entry: entry.name)
         
-        for pdf_path in pdf_files:
+        for entry in pdf_files:
             # Extract clean name from filename
-            raw_name = pdf_path.stem  # Get filename without extension
+            raw_name = os.path.splitext(entry.name)[0]  # Get filename without extension
             
             # Clean the name: remove hyphens, underscores, make title case
-            clean_name = raw_name.replace('-', ' ').replace('_', ' ').title()
+            clean_name = raw_name.translate(_CLEAN_NAME_TABLE).title()
             
             # Create document name (lowercase with underscores for internal use)
-            doc_name = raw_name.lower().replace('-', '_').replace(' ', '_')
+            doc_name = raw_name.lower().translate(_DOC_NAME_TABLE)
+            
+            # Files differing only by case (e.g. "menu.pdf" / "MENU.PDF") map to the same document
+            if doc_name in self._documents_by_name:
+                print(f"⚠️  Skipping {entry.name}: duplicate of document '{doc_name}'")
+                continue
             
             # Create document configuration
             doc_config = DocumentConfig(
                 name=doc_name,
-                pdf_path=str(pdf_path),
+                pdf_path=entry.path,
                 processed_json_path=f"data/processed/{doc_name}_processed.json",
                 description=f"{clean_name} - Pizzeria menu and services",
                 language="fr",
-                content_type="menu"
+                content_type="menu",
+                company_name=clean_name
             )
             
             documents.append(doc_config)
+            self._documents_by_name[doc_name] = doc_config
         
         # Log discovered documents
-        if documents:
-            print(f"📁 Auto-discovered {len(documents)} PDF documents:")
-            for doc in documents:
-                print(f"   - {doc.name}: {doc.description}")
-        else:
-            print("⚠️  No PDF files found in docs/raw_pdfs/")
-            print(f"   Please add PDF files to: {self.raw_pdfs_path}")
+        if announce:
+            if documents:
+                print(f"📁 Auto-discovered {len(documents)} PDF documents:")
+                for doc in documents:
+                    print(f"   - {doc.name}: {doc.description}")
+            else:
+                print("⚠️  No PDF files found in docs/raw_pdfs/")
+                print(f"   Please add PDF files to: {self.raw_pdfs_path}")
         
         return documents
     
+    def refresh_documents(self) -> bool:
+        """
+        Re-scans the raw_pdfs directory in place, for long-running processes (e.g. the pipeline daemon)
+        that must see PDFs added or removed since startup. Documents registered with add_document from
+        outside raw_pdfs are kept while their PDF still exists.
+
+        Returns:
+            bool: True if the set of documents changed.
+        """
+        previous = {doc.name: doc for doc in self.documents}
+        self._documents_by_name = {}
+        documents = self._init_documents(announce=False)
+        raw_pdfs_path = self.raw_pdfs_path.resolve()
+        for doc in previous.values():
+            pdf_path = Path(doc.pdf_path)
+            if (doc.name not in self._documents_by_name and pdf_path.resolve().parent != raw_pdfs_path
+                    and pdf_path.is_file()):
+                documents.append(doc)
+                self._documents_by_name[doc.name] = doc
+        # Replaced in place so modules holding this instance (or the list) see the change
+        self.documents[:] = documents
+        changed = set(previous) != set(self._documents_by_name)
+        if changed:
+            print(f"📁 Documents changed: now {len(documents)} PDF documents")
+        return changed
+    
     def _create_directories(self):
         """
         Creates necessary directories for raw PDFs, processed data, and logs if they do not already exist.
@@ -151,8 +271,11 @@ class ModularConfig:
         Returns:
             None
         """
-        for path in [self.raw_pdfs_path, self.processed_path, self.logs_path]:
-            path.mkdir(parents=True, exist_ok=True)
+        # Parents first; a cheap is_dir() check avoids mkdir calls on an already bootstrapped tree
+        paths = sorted({self.raw_pdfs_path, self.processed_path, self.logs_path}, key=lambda p: len(p.parts))
+        for path in paths:
+            if not path.is_dir():
+                path.mkdir(parents=True, exist_ok=True)
     
     def get_document_by_name(self, name: str) -> DocumentConfig:
         """
@@ -168,10 +291,10 @@ class ModularConfig:
         Raises:
             ValueError: If the document with the given name is not found.
         """
-        for doc in self.documents:
-            if doc.name == name:
-                return doc
-        raise ValueError(f"Document '{name}' not found")
+        doc = self._documents_by_name.get(name)
+        if doc is None:
+            raise ValueError(f"Document '{name}' not found")
+        return doc
     
     def get_collection_name(self, document_name: str) -> str:
         """
@@ -210,10 +333,13 @@ class ModularConfig:
             processed_json_path=processed_json_path,
             description=description,
             language=language,
-            content_type=content_type
+            content_type=content_type,
+            # Company name is everything before the first " - " of the description
+            company_name=description.split(' - ', 1)[0]
         )
         
         self.documents.append(new_doc)
+        self._documents_by_name[name] = new_doc
         return new_doc
     
     def get_available_documents(self) -> Dict[str, str]:
@@ -228,8 +354,8 @@ class ModularConfig:
     
     def get_company_name(self, document_name: str) -> str:
         """
-        Retrieves the company name associated with a document by extracting it from the document's description.
-        Returns the company name as a string, or a cleaned version of the document name if extraction fails.
+        Retrieves the company name associated with a document, precomputed when the document was registered.
+        Returns the company name as a string, or a cleaned version of the document name if the document is unknown.
 
         Args:
             document_name (str): The name of the document to retrieve the company name for.
@@ -237,13 +363,11 @@ class ModularConfig:
         Returns:
             str: The extracted company name or a cleaned document name as fallback.
         """
-        try:
-            doc_config = self.get_document_by_name(document_name)
-            # Extract company name from description (everything before the first hyphen)
-            return doc_config.description.split(' - ')[0]
-        except Exception:
-            # Fallback: clean the document name
-            return document_name.replace('_', ' ').title()
+        doc_config = self._documents_by_name.get(document_name)
+        if doc_config is not None and doc_config.company_name:
+            return doc_config.company_name
+        # Fallback: clean the document name
+        return document_name.replace('_', ' ').title()
     
     def get_companies_summary(self) -> Dict[str, Dict]:
         """
@@ -255,14 +379,27 @@ class ModularConfig:
         """
         companies = {}
         for doc in self.documents:
-            company_name = self.get_company_name(doc.name)
             companies[doc.name] = {
-                'company_name': company_name,
+                'company_name': doc.company_name or self.get_company_name(doc.name),
                 'description': doc.description,
                 'pdf_path': doc.pdf_path,
                 'language': doc.language
             }
         return companies
 
-# Global configuration instance
-config = ModularConfig()
+@lru_cache(maxsize=1)
+def get_config() -> ModularConfig:
+    """
+    Returns the global configuration instance, creating it on first use.
+    Construction scans the documents folder and creates directories, so it is deferred until actually needed.
+
+    Returns:
+        ModularConfig: The shared configuration instance.
+    """
+    return ModularConfig()
+
+def __getattr__(name: str):
+    # Keep `from config.config import config` working while creating the instance lazily
+    if name == "config":
+        return get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
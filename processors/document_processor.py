@@ -1,9 +1,52 @@
+import hashlib
 import json
 import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Any, Optional, Tuple
 import fitz  # PyMuPDF
-from config.config import config, DocumentConfig
+from config.config import DocumentConfig, get_config
+
+try:
+    import orjson  # Optional: much faster JSON serialization
+except ImportError:
+    orjson = None
+
+PROCESSOR_VERSION = "modular_v1.0"
+
+# Number of pages handed to a worker process at a time by process_all_documents
+PAGE_BATCH_SIZE = 8
+
+# Default number of extraction worker processes; PyMuPDF parsing stops scaling much beyond a few
+DEFAULT_NUM_WORKERS = min(os.cpu_count() or 1, 4)
+
+# Start method for extraction workers: forking a process that already runs threads (the app's IO pool,
+# Ollama connections) can deadlock the child, so workers start from a clean interpreter instead
+WORKER_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Called as progress_callback(current, total, document_name) each time a document is finished
+ProgressCallback = Callable[[int, int, str], None]
+
+# Called as document_callback(document_name, success) as soon as a document is finished,
+# so later stages can start on it while the remaining documents are still being processed
+DocumentCallback = Callable[[str, bool], None]
+
+# Matches one whitespace-separated word; used to count words without building token lists
+_WORD_RE = re.compile(r'\S+')
+
+
+# Shared compact encoder: json.dumps() with non-default options builds a new encoder on every call
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serializes an object to compact UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _JSON_ENCODER.encode(obj).encode('utf-8')
 
 class DocumentProcessor:
     """
@@ -14,8 +57,55 @@ class DocumentProcessor:
     and integrates with the system configuration for document management.
     """
     
-    def __init__(self):
+    def __init__(self, num_workers: Optional[int] = None):
+        """
+        Initializes the DocumentProcessor.
+
+        Args:
+            num_workers (Optional[int], optional): Worker processes used by process_all_documents; 1 processes
+                documents sequentially in this process. Defaults to DEFAULT_NUM_WORKERS.
+        """
         self.logger = logging.getLogger(__name__)
+        self.num_workers = max(1, num_workers or DEFAULT_NUM_WORKERS)
+    
+    def iter_pdf_sections(self, pdf_path: str, start: int = 0,
+                          stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily extracts text content from each page of a PDF file, yielding one section at a time.
+        Only one page of text is held in memory, which keeps large menus cheap to process.
+
+        Args:
+            pdf_path (str): The file path to the PDF document.
+            start (int, optional): Index of the first page to extract. Defaults to 0.
+            stop (Optional[int], optional): Index one past the last page to extract. Defaults to the last page.
+
+        Yields:
+            Dict[str, Any]: A section dictionary with page, content, and word count.
+        """
+        with fitz.open(pdf_path) as doc:
+            yield from self._iter_doc_sections(doc, start, stop)
+    
+    @staticmethod
+    def _iter_doc_sections(doc: "fitz.Document", start: int = 0,
+                           stop: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yields the sections of pages [start, stop) of an already opened PDF (see iter_pdf_sections)"""
+        for page in doc.pages(start, stop):
+            # Plain-text mode with explicit flags is PyMuPDF's cheapest extraction path
+            text = page.get_text("text", flags=fitz.TEXTFLAGS_TEXT) # type: ignore
+            page_number = page.number + 1
+            # Release the page (and its MuPDF caches) before handing the text to the consumer
+            del page
+            
+            # Only add pages with content; isspace() avoids copying blank pages
+            if not text or text.isspace():
+                continue
+            text = text.strip()
+            
+            yield {
+                "page": page_number,
+                "content": text,
+                "word_count": sum(1 for _ in _WORD_RE.finditer(text))
+            }
     
     def extract_text_from_pdf(self, pdf_path: str) -> List[Dict[str, Any]]:
         """
@@ -29,28 +119,81 @@ class DocumentProcessor:
             List[Dict[str, Any]]: A list of section dictionaries with page, content, and word count.
         """
         try:
-            doc = fitz.open(pdf_path)
-            sections = []
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text = page.get_text() # type: ignore
-                
-                if text.strip():  # Only add pages with content
-                    sections.append({
-                        "page": page_num + 1,
-                        "content": text.strip(),
-                        "word_count": len(text.split())
-                    })
-            
-            doc.close()
-            self.logger.info(f"Extracted text from {len(sections)} pages")
+            sections = list(self.iter_pdf_sections(pdf_path))
+            self.logger.info("Extracted text from %d pages", len(sections))
             return sections
             
         except Exception as e:
-            self.logger.error(f"Error extracting text from PDF: {e}")
+            self.logger.error("Error extracting text from PDF: %s", e)
             return []
     
+    @staticmethod
+    def _write_json_fields(f: BinaryIO, fields: Dict[str, Any]):
+        """Writes the given key/value pairs as members of an already opened JSON object"""
+        for key, value in fields.items():
+            f.write(_dumps(key) + b":" + _dumps(value) + b",")
+    
+    def _save_sections(self, document_config: DocumentConfig, sections: Iterable[Dict[str, Any]]) -> bool:
+        """
+        Writes a document's structured JSON, streaming the given sections to disk as they are produced.
+        Page and word totals are accumulated on the way; the previous output is only replaced once complete.
+
+        Args:
+            document_config (DocumentConfig): The configuration object for the document being saved.
+            sections (Iterable[Dict[str, Any]]): The document's sections, in page order.
+
+        Returns:
+            bool: True if at least one section was saved, False if there was no content.
+        """
+        output_path = Path(document_config.processed_json_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
+        
+        total_pages = 0
+        total_words = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(b"{")
+                self._write_json_fields(f, {
+                    "source": document_config.pdf_path,
+                    "document_name": document_config.name,
+                    "description": document_config.description,
+                    "language": document_config.language,
+                    "content_type": document_config.content_type,
+                })
+                f.write(b'"sections":[')
+                for section in sections:
+                    if total_pages:
+                        f.write(b",")
+                    f.write(_dumps(section))
+                    total_pages += 1
+                    total_words += section["word_count"]
+                f.write(b"],")
+                self._write_json_fields(f, {
+                    "total_pages": total_pages,
+                    "total_words": total_words,
+                })
+                f.write(b'"processing_metadata":')
+                f.write(_dumps({
+                    "processor_version": PROCESSOR_VERSION,
+                    "extraction_method": "PyMuPDF"
+                }))
+                f.write(b"}")
+            
+            if not total_pages:
+                self.logger.error("No content extracted from %s", document_config.pdf_path)
+                return False
+            
+            # Only replace the previous output once the new one is complete
+            tmp_path.replace(output_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        
+        self.logger.info("✅ Processed %s: %d pages, %d words → %s",
+                         document_config.name, total_pages, total_words, output_path)
+        
+        return True
+    
     def process_document(self, document_config: DocumentConfig) -> bool:
         """
         Processes a single document by extracting text from its PDF and saving structured data to JSON.
@@ -65,70 +208,293 @@ class DocumentProcessor:
         try:
             pdf_path = Path(document_config.pdf_path)
             if not pdf_path.exists():
-                self.logger.error(f"PDF file not found: {pdf_path}")
+                self.logger.error("PDF file not found: %s", pdf_path)
                 return False
             
-            self.logger.info(f"Processing document: {document_config.name}")
-            
-            # Extract text from PDF
-            sections = self.extract_text_from_pdf(str(pdf_path))
-            
-            if not sections:
-                self.logger.error(f"No content extracted from {pdf_path}")
-                return False
-            
-            # Create structured data
-            structured_data = {
-                "source": str(pdf_path),
-                "document_name": document_config.name,
-                "description": document_config.description,
-                "language": document_config.language,
-                "content_type": document_config.content_type,
-                "total_pages": len(sections),
-                "total_words": sum(section["word_count"] for section in sections),
-                "sections": sections,
-                "processing_metadata": {
-                    "processor_version": "modular_v1.0",
-                    "extraction_method": "PyMuPDF"
-                }
-            }
-            
-            # Save processed data
-            output_path = Path(document_config.processed_json_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(structured_data, f, indent=2, ensure_ascii=False)
+            self.logger.debug("Processing document: %s", document_config.name)
             
-            self.logger.info(f"✅ Processed {document_config.name}: {len(sections)} pages, "
-                           f"{structured_data['total_words']} words")
-            self.logger.info(f"📄 Saved to: {output_path}")
+            # Documents longer than one page batch are extracted in parallel across worker processes
+            if self.num_workers > 1:
+                page_batches = self._plan_page_batches(document_config)
+                if not page_batches:
+                    return False
+                if len(page_batches) > 1:
+                    results = {document_config.name: False}
+                    self._process_in_pool({document_config.name: (document_config, page_batches)},
+                                          results, lambda name: None)
+                    return results[document_config.name]
             
-            return True
+            return self._save_sections(document_config, self.iter_pdf_sections(str(pdf_path)))
             
         except Exception as e:
-            self.logger.error(f"Error processing document {document_config.name}: {e}")
+            self.logger.error("Error processing document %s: %s", document_config.name, e)
             return False
     
-    def process_all_documents(self) -> Dict[str, bool]:
+    @property
+    def manifest_path(self) -> Path:
+        """Location of the manifest recording the source PDF state of each processed document"""
+        return get_config().processed_path / "_manifest.json"
+    
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Loads the processing manifest, returning an empty one if it is missing or unreadable"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_manifest(self, manifest: Dict[str, Dict[str, Any]]):
+        """Atomically writes the processing manifest to disk"""
+        try:
+            tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            tmp_path.replace(self.manifest_path)
+        except OSError as e:
+            self.logger.warning("Could not save processing manifest: %s", e)
+    
+    @staticmethod
+    def _manifest_entry(document_config: DocumentConfig) -> Dict[str, Any]:
+        """Builds the manifest entry describing the current state of a document's source PDF"""
+        st = os.stat(document_config.pdf_path)
+        return {
+            "mtime": st.st_mtime,
+            "size": st.st_size,
+            "out": document_config.processed_json_path,
+            "processor_version": PROCESSOR_VERSION
+        }
+    
+    @staticmethod
+    def _file_sha256(path: str) -> str:
+        """Returns the SHA-256 hex digest of a file's content, read in 1 MiB blocks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _recorded_entry(self, document_config: DocumentConfig, current: Dict[str, Any]) -> Dict[str, Any]:
+        """Completes a just-processed document's manifest entry with the content hash of its PDF"""
+        try:
+            return dict(current, sha256=self._file_sha256(document_config.pdf_path))
+        except OSError:
+            return current
+    
+    def is_up_to_date(self, document_config: DocumentConfig,
+                      manifest: Optional[Dict[str, Dict[str, Any]]] = None,
+                      current: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Checks whether a document's processed JSON is still current for its source PDF.
+        Compares the PDF's modification time and size against the processing manifest; a PDF that was
+        only touched or re-copied (same size, new modification time) is confirmed by its content hash,
+        and the manifest entry's modification time is then refreshed in place.
+
+        Args:
+            document_config (DocumentConfig): The configuration object for the document to check.
+            manifest (Optional[Dict]): An already loaded manifest, or None to read it from disk.
+            current (Optional[Dict]): The PDF's current manifest entry if already computed, or None to stat it.
+
+        Returns:
+            bool: True if the document can be skipped, False if it needs (re)processing.
+        """
+        if manifest is None:
+            manifest = self._load_manifest()
+        entry = manifest.get(document_config.name)
+        if not entry:
+            return False
+        if current is None:
+            try:
+                current = self._manifest_entry(document_config)
+            except OSError:
+                return False
+        if not Path(document_config.processed_json_path).exists():
+            return False
+        if all(entry.get(key) == value for key, value in current.items()):
+            return True
+        
+        # Only the modification time changed: hash the content before deciding to reprocess
+        if entry.get("sha256") and all(entry.get(key) == current[key] for key in ("size", "out", "processor_version")):
+            try:
+                unchanged = self._file_sha256(document_config.pdf_path) == entry["sha256"]
+            except OSError:
+                return False
+            if unchanged:
+                entry["mtime"] = current["mtime"]
+            return unchanged
+        return False
+    
+    def _plan_page_batches(self, document_config: DocumentConfig) -> List[Tuple[int, int]]:
+        """
+        Splits a document's pages into (start, stop) ranges of at most PAGE_BATCH_SIZE pages.
+        Returns an empty list (after logging) if the PDF cannot be opened or has no pages.
+
+        Args:
+            document_config (DocumentConfig): The configuration object for the document to split.
+
+        Returns:
+            List[Tuple[int, int]]: The page ranges to extract.
+        """
+        try:
+            with fitz.open(document_config.pdf_path) as doc:
+                page_count = len(doc)
+        except Exception as e:
+            self.logger.error("Error processing document %s: %s", document_config.name, e)
+            return []
+        if not page_count:
+            self.logger.error("No content extracted from %s", document_config.pdf_path)
+            return []
+        return [(start, min(start + PAGE_BATCH_SIZE, page_count))
+                for start in range(0, page_count, PAGE_BATCH_SIZE)]
+    
+    def _process_in_pool(self, batch_plan: Dict[str, Tuple[DocumentConfig, List[Tuple[int, int]]]],
+                         results: Dict[str, bool], report: Callable[[str], None]):
+        """
+        Extracts the planned page batches in worker processes and saves each document as soon as all of its pages are in.
+        Work is split into page batches rather than whole documents, so one long PDF cannot leave
+        the other workers idle at the end of the run.
+        Updates results in place and calls report(name) as each document finishes.
+
+        Args:
+            batch_plan (Dict[str, Tuple[DocumentConfig, List[Tuple[int, int]]]]): Document config and
+                page ranges (from _plan_page_batches) by document name.
+            results (Dict[str, bool]): Processing results by document name, updated in place.
+            report (Callable[[str], None]): Called with a document name once it is finished.
+        """
+        total_batches = sum(len(page_batches) for _, page_batches in batch_plan.values())
+        max_workers = max(1, min(total_batches, self.num_workers))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 mp_context=multiprocessing.get_context(WORKER_START_METHOD)) as executor:
+            self.logger.info("Processing %d document(s) in %d page batches on %d worker(s)...",
+                             len(batch_plan), total_batches, max_workers)
+            futures = {}
+            for doc_config, page_batches in batch_plan.values():
+                self.logger.debug("Queued %s (%d page batches)", doc_config.name, len(page_batches))
+                for start, stop in page_batches:
+                    future = executor.submit(_extract_page_batch, doc_config.pdf_path, start, stop)
+                    futures[future] = doc_config.name
+            
+            pending = {name: len(page_batches) for name, (_, page_batches) in batch_plan.items()}
+            collected: Dict[str, List[Dict[str, Any]]] = {name: [] for name in batch_plan}
+            failed = set()
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    collected[name].extend(future.result())
+                except Exception as e:
+                    self.logger.error("Worker failed while processing %s: %s", name, e)
+                    failed.add(name)
+                
+                pending[name] -= 1
+                if pending[name]:
+                    continue
+                
+                # Last batch of this document is in: write it out in page order
+                sections = collected.pop(name)
+                if name not in failed:
+                    sections.sort(key=lambda section: section["page"])
+                    try:
+                        results[name] = self._save_sections(batch_plan[name][0], sections)
+                    except Exception as e:
+                        self.logger.error("Error processing document %s: %s", name, e)
+                report(name)
+        
+    
+    def process_all_documents(self, force: bool = False,
+                              documents: Optional[Iterable[DocumentConfig]] = None,
+                              progress_callback: Optional[ProgressCallback] = None,
+                              document_callback: Optional[DocumentCallback] = None) -> Dict[str, bool]:
         """
         Processes all documents defined in the system configuration and saves their structured data.
+        Documents are extracted in parallel worker processes, since PDF text extraction is CPU-bound.
+        Documents whose source PDF is unchanged since the last run are skipped unless force is set.
         Returns a dictionary mapping document names to their processing success status.
 
+        Args:
+            force (bool, optional): Reprocess every document even if unchanged. Defaults to False.
+            documents (Optional[Iterable[DocumentConfig]], optional): Documents to process, for callers
+                that already have the list. Defaults to every configured document.
+            progress_callback (Optional[ProgressCallback], optional): Called with (current, total, name)
+                as each document finishes, whether processed, skipped or failed. Defaults to None.
+            document_callback (Optional[DocumentCallback], optional): Called with (name, success) as each
+                document finishes; skipped documents count as successful. Defaults to None.
+
         Returns:
             Dict[str, bool]: A dictionary with document names as keys and processing success as values.
         """
-        results = {}
+        if documents is None:
+            documents = get_config().documents
+        documents = list(documents)
+        # Pre-fill in configuration order so the result order doesn't depend on completion order
+        results = {doc_config.name: False for doc_config in documents}
+        finished = 0
         
-        for doc_config in config.documents:
-            self.logger.info(f"Processing {doc_config.name}...")
-            results[doc_config.name] = self.process_document(doc_config)
+        def report(name: str):
+            nonlocal finished
+            finished += 1
+            if progress_callback is not None:
+                progress_callback(finished, len(documents), name)
+            if document_callback is not None:
+                document_callback(name, results[name])
+        
+        # Loaded even when forced: documents outside this run keep their entries
+        manifest = self._load_manifest()
+        
+        # Each source PDF is stat'ed once; the entry serves the up-to-date check,
+        # the missing-file check and the manifest update after processing
+        current_entries: Dict[str, Dict[str, Any]] = {}
+        to_process = []
+        skipped = []
+        refreshed = False
+        for doc_config in documents:
+            try:
+                current_entries[doc_config.name] = self._manifest_entry(doc_config)
+            except OSError:
+                self.logger.error("PDF file not found: %s", doc_config.pdf_path)
+                report(doc_config.name)
+                continue
+            recorded_mtime = manifest.get(doc_config.name, {}).get("mtime")
+            if not force and self.is_up_to_date(doc_config, manifest, current_entries[doc_config.name]):
+                # The content hash vouched for a touched PDF: its refreshed entry needs saving
+                refreshed |= recorded_mtime != current_entries[doc_config.name]["mtime"]
+                skipped.append(doc_config.name)
+                results[doc_config.name] = True
+                report(doc_config.name)
+            else:
+                to_process.append(doc_config)
+        documents = to_process
+        # One line for all unchanged documents rather than one per document
+        if skipped:
+            self.logger.info("⏭️ %d unchanged document(s) skipped: %s", len(skipped), ', '.join(skipped))
+        
+        if documents:
+            if self.num_workers == 1:
+                # Sequential fallback (e.g. slow rotating disks): stream each document in-process
+                for doc_config in documents:
+                    results[doc_config.name] = self.process_document(doc_config)
+                    report(doc_config.name)
+            else:
+                batch_plan = {}
+                for doc_config in documents:
+                    page_batches = self._plan_page_batches(doc_config)
+                    if page_batches:
+                        batch_plan[doc_config.name] = (doc_config, page_batches)
+                    else:
+                        report(doc_config.name)
+                self._process_in_pool(batch_plan, results, report)
+            
+            # Record the source state of everything that was just (re)processed; failures are retried next run
+            for doc_config in documents:
+                if results[doc_config.name]:
+                    manifest[doc_config.name] = self._recorded_entry(doc_config, current_entries[doc_config.name])
+                else:
+                    manifest.pop(doc_config.name, None)
+        if documents or refreshed:
+            self._save_manifest(manifest)
         
         # Summary
-        successful = sum(bool(success)
-                     for success in results.values())
+        successful = sum(results.values())
         total = len(results)
-        self.logger.info(f"📊 Processing complete: {successful}/{total} documents successful")
+        self.logger.info("📊 Processing complete: %d/%d documents successful", successful, total)
         
         return results
     
@@ -144,12 +510,52 @@ class DocumentProcessor:
             bool: True if the document is processed successfully, False otherwise.
         """
         try:
-            doc_config = config.get_document_by_name(document_name)
-            return self.process_document(doc_config)
+            doc_config = get_config().get_document_by_name(document_name)
+            manifest = self._load_manifest()
+            recorded_mtime = manifest.get(document_name, {}).get("mtime")
+            if self.is_up_to_date(doc_config, manifest):
+                self.logger.info("⏭️ %s unchanged, skipping", document_name)
+                if manifest[document_name]["mtime"] != recorded_mtime:
+                    self._save_manifest(manifest)
+                return True
+            
+            success = self.process_document(doc_config)
+            if success:
+                manifest[document_name] = self._recorded_entry(doc_config, self._manifest_entry(doc_config))
+                self._save_manifest(manifest)
+            return success
         except ValueError as e:
-            self.logger.error(f"Document not found: {e}")
+            self.logger.error("Document not found: %s", e)
             return False
 
+# Per-worker state, set up once by _init_worker: the most recently opened PDF is kept open
+# so consecutive page batches of the same document reuse its parsed structure and font cache
+_worker_doc: Optional["fitz.Document"] = None
+_worker_doc_path: Optional[str] = None
+
+def _init_worker():
+    """Worker process initializer: starts each worker with an empty document cache (even when forked)"""
+    global _worker_doc, _worker_doc_path
+    _worker_doc = None
+    _worker_doc_path = None
+
+def _close_worker_doc():
+    """Closes the PDF currently cached by this worker, if any"""
+    global _worker_doc, _worker_doc_path
+    if _worker_doc is not None:
+        _worker_doc.close()
+    _worker_doc = None
+    _worker_doc_path = None
+
+def _extract_page_batch(pdf_path: str, start: int, stop: int) -> List[Dict[str, Any]]:
+    """Worker entry point: extracts the sections of pages [start, stop) (module-level so it is picklable)"""
+    global _worker_doc, _worker_doc_path
+    if _worker_doc_path != pdf_path:
+        _close_worker_doc()
+        _worker_doc = fitz.open(pdf_path)
+        _worker_doc_path = pdf_path
+    return list(DocumentProcessor._iter_doc_sections(_worker_doc, start, stop))
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     
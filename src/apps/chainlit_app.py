@@ -2,45 +2,95 @@ import chainlit as cl
 import logging
 import asyncio
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
 
-# Add project root to path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+# Make the project root importable when run as a script from a source checkout
+# (not needed once installed with `pip install -e .`); never added twice
+_project_root = str(Path(__file__).resolve().parents[2])
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
 
-from config.config import config
-from src.core.rag_engine import LLMInterface
-from src.core.pipeline import Pipeline
+from config.config import DocumentConfig, get_config
 
-# Initialize components
-pipeline = Pipeline()
-llm_interface = LLMInterface()
+# Components are created on first use so the UI starts without waiting for
+# Chroma/Ollama initialization; the lock stops concurrent first calls from building twice
+_init_lock = threading.Lock()
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+@lru_cache(maxsize=1)
+def _create_llm_interface():
+    from src.core.rag_engine import LLMInterface
+    return LLMInterface()
 
-async def store_session_data(status, available_docs):
-    """Store status data in session for easy access"""
-    cl.user_session.set("system_status", status)
-    cl.user_session.set("available_docs", available_docs)
-    logger.info("📊 System status and document info stored in session") 
+@lru_cache(maxsize=1)
+def _create_pipeline():
+    from src.core.pipeline import Pipeline
+    return Pipeline()
 
+def get_llm_interface():
+    """Returns the shared LLMInterface, creating it on first use"""
+    with _init_lock:
+        return _create_llm_interface()
 
-@cl.on_chat_start
-async def start():
-    """Initialize the chat session"""
-    logger.info("🍕 Starting new Chainlit session")
+def get_pipeline():
+    """Returns the shared Pipeline, creating it on first use"""
+    with _init_lock:
+        return _create_pipeline()
 
-    # Get system status asynchronously
-    loop = asyncio.get_event_loop()
-    status = await loop.run_in_executor(None, llm_interface.get_system_status)
-    available_docs = await loop.run_in_executor(None, llm_interface.get_available_documents)
+# Dedicated executors instead of asyncio's shared default pool: blocking RAG/Ollama calls
+# get their own bounded pool, and long document processing runs on a separate single
+# worker (it already parallelizes PDF extraction across processes internally)
+IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="rag-io")
+PROCESSING_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-process")
 
-    # Store status data in session
-    await store_session_data(status, available_docs)
+# Sentinel returned by next() once an answer stream is exhausted
+_STREAM_END = object()
 
-    # Create welcome message (clean, without system status)
-    welcome_msg = """# 🍕 Bienvenue dans l'Assistant Pizzeria!
+# Held while /process runs so concurrent requests don't process the same PDFs twice
+_process_lock = asyncio.Lock()
+
+# How long system status / document lists are reused across sessions (seconds)
+STATUS_CACHE_TTL = 30.0
+
+class _StatusCache:
+    """
+    Caches the result of a blocking call for a short time, shared by all chat sessions.
+    Concurrent callers wait on a lock, so an expired entry triggers a single upstream call.
+    """
+
+    def __init__(self, fetch: Callable[[], Any], ttl: float = STATUS_CACHE_TTL):
+        self._fetch = fetch
+        self._ttl = ttl
+        self._value = None
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> Any:
+        """Returns the cached value, refreshing it in IO_POOL if it has expired"""
+        async with self._lock:
+            if time.monotonic() >= self._expires_at:
+                loop = asyncio.get_running_loop()
+                self._value = await loop.run_in_executor(IO_POOL, self._fetch)
+                self._expires_at = time.monotonic() + self._ttl
+            return self._value
+
+    def invalidate(self):
+        """Forces the next get() to fetch a fresh value"""
+        self._expires_at = 0.0
+
+system_status_cache = _StatusCache(lambda: get_llm_interface().get_system_status())
+available_documents_cache = _StatusCache(lambda: get_llm_interface().get_available_documents())
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Static chat messages, built once at import rather than on every session/command
+WELCOME_MSG = """# 🍕 Bienvenue dans l'Assistant Pizzeria!
 
 ## 💬 Comment utiliser:
 1. **Questions générales**: "Quelles pizzas avez-vous?" → Recherche dans tous les documents
@@ -64,7 +114,116 @@ async def start():
 Posez votre question et je vous aiderai! 🚀
 """
 
-    await cl.Message(content=welcome_msg).send()
+HELP_MSG = """# 🆘 Aide - Pizzeria RAG
+
+## 💬 Questions normales:
+Posez simplement votre question en français!
+- "Quelles pizzas avez-vous?"
+- "Prix de la Margherita?"
+- "Options végétariennes chez Marco Fuso?"
+
+## 🔧 Commandes spéciales:
+- `/status` - Statut détaillé du système
+- `/documents` - Liste des documents disponibles  
+- `/process` - Traiter/retraiter les documents
+- `/help` - Afficher cette aide
+
+## 💡 Conseils:
+- Mentionnez un restaurant spécifique pour des résultats ciblés
+- Posez des questions générales pour comparer les options
+- Soyez spécifique dans vos questions pour de meilleurs résultats
+
+## 🔧 En cas de problème:
+1. Vérifiez que Ollama fonctionne: `ollama serve`
+2. Traitez les documents: `/process`
+3. Vérifiez le statut: `/status`
+"""
+
+STATUS_TEMPLATE = """# 📊 Statut détaillé du système
+
+## 🤖 Ollama:
+- **Modèle de chat** ({chat_model}): {ollama_chat}
+- **Modèle d'embeddings** ({embedding_model}): {ollama_embed}
+
+## 🔍 Base vectorielle:
+- **Collections**: {total_collections}
+- **Documents indexés**: {total_documents}
+- **Chunks totaux**: {total_chunks}
+
+## 📚 Documents:
+{doc_details}
+
+## ⚙️ Configuration:
+- **Taille des chunks**: {chunk_size}
+- **Chevauchement**: {overlap}
+- **Température LLM**: {temperature}
+"""
+
+DOCUMENTS_TEMPLATE = """# 📚 Documents disponibles
+
+{doc_list}
+
+💡 **Astuce:** Vous pouvez mentionner un restaurant spécifique dans votre question pour obtenir des informations ciblées, ou poser une question générale pour comparer les options.
+"""
+
+async def store_session_data(status, available_docs):
+    """Store status data in session for easy access"""
+    cl.user_session.set("system_status", status)
+    cl.user_session.set("available_docs", available_docs)
+    logger.info("📊 System status and document info stored in session") 
+
+
+def _is_latest_message(msg: cl.Message) -> bool:
+    """
+    Checks whether a message is still at the bottom of the conversation, followed at most by
+    the user's command being handled.
+    """
+    messages = cl.chat_context.get()
+    if not messages:
+        return False
+    if messages[-1].id == msg.id:
+        return True
+    return len(messages) >= 2 and messages[-2].id == msg.id and messages[-1].type == "user_message"
+
+
+async def send_diagnostic(content: str):
+    """
+    Shows short-lived diagnostic output (/status, /documents, /help...) in a single message per session.
+    The first call sends the message; later calls update it in place instead of posting a new one,
+    as long as it is still the latest message (otherwise the update would happen off-screen).
+
+    Args:
+        content (str): The Markdown content to display.
+
+    Returns:
+        None
+    """
+    diag_msg = cl.user_session.get("diag_msg")
+    if diag_msg is not None and _is_latest_message(diag_msg):
+        diag_msg.content = content
+        await diag_msg.update()
+    else:
+        diag_msg = cl.Message(content=content)
+        await diag_msg.send()
+        cl.user_session.set("diag_msg", diag_msg)
+
+
+@cl.on_chat_start
+async def start():
+    """Initialize the chat session"""
+    logger.info("🍕 Starting new Chainlit session")
+
+    # Get system status and documents concurrently (independent blocking calls)
+    status, available_docs = await asyncio.gather(
+        system_status_cache.get(),
+        available_documents_cache.get(),
+    )
+
+    # Store status data in session
+    await store_session_data(status, available_docs)
+
+    # Send welcome message (clean, without system status)
+    await cl.Message(content=WELCOME_MSG).send()
 
     # Store session data
     cl.user_session.set("available_documents", available_docs)
@@ -93,47 +252,44 @@ async def main(message: cl.Message):
         await handle_command(user_message)
         return
     
+    # The answer message is created before the step so it is not nested inside it,
+    # and is filled in token by token as the model generates
+    response = cl.Message(content="")
+    
     # Send thinking message and process
     async with cl.Step(name="search", type="run") as step:
         step.output = "🤔 Je cherche dans nos documents..."
         
         try:
             # Process the question in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, llm_interface.answer_question, user_message)
+            loop = asyncio.get_running_loop()
+            # Filled with the answer's status once the stream ends (offline fallback or interrupted answer: "error")
+            outcome = {}
+            tokens = await loop.run_in_executor(
+                IO_POOL, lambda: get_llm_interface().stream_answer(user_message, outcome=outcome))
             
-            if result['status'] == 'success':
-                response_content = result['answer']
-                
-                # Log context information for debugging (not shown to user)
-                if result['has_context']:
-                    if result['has_multiple_companies']:
-                        companies = ", ".join(result['companies_found'])
-                        logger.info(f"📊 Multi-company response - Sources: {companies}")
-                    else:
-                        companies = ", ".join(result['companies_found']) if result['companies_found'] else "nos documents"
-                        logger.info(f"📄 Single-company response - Source: {companies}")
-                else:
-                    logger.info("⚠️ No specific context found in documents")
-                
+            # Each token is pulled from the blocking generator on the pool
+            while (token := await loop.run_in_executor(IO_POOL, next, tokens, _STREAM_END)) is not _STREAM_END:
+                await response.stream_token(token)
+            
+            if outcome.get("status") == "success":
                 step.output = "✅ Recherche terminée"
-                
             else:
-                response_content = f"❌ Désolé, une erreur s'est produite: {result.get('answer', 'Erreur inconnue')}"
                 step.output = "❌ Erreur lors de la recherche"
                 
         except Exception as e:
             logger.error(f"Error processing message: {e}")
             step.output = f"❌ Erreur: {str(e)}"
-            response_content = f"❌ Erreur lors du traitement: {str(e)}"
+            response.content = f"❌ Erreur lors du traitement: {str(e)}"
     
     # Send the final response
-    await cl.Message(content=response_content).send()
+    await response.send()
 
 async def handle_command(command: str):
     """
     Handles special slash commands sent by the user in the Chainlit chat.
-    Executes system status, document listing, processing, help, or returns an error for unknown commands.
+    Looks the command up in the _COMMANDS table and runs it with any arguments that follow,
+    or returns an error for unknown commands.
 
     Args:
         command (str): The command string sent by the user.
@@ -141,32 +297,53 @@ async def handle_command(command: str):
     Returns:
         None
     """
+    name, *args = command.split()
+    handler = _COMMANDS.get(name)
     
-    if command == '/status':
-        await show_status()
-    
-    elif command == '/documents':
-        await show_documents()
-    
-    elif command == '/process':
-        await process_documents()
-    
-    elif command == '/help':
-        await show_help()
+    if handler is None:
+        await send_diagnostic(f"❓ **Commande inconnue:** `{command}`\n\nUtilisez `/help` pour voir les commandes disponibles.")
+        return
     
-    else:
-        await cl.Message(content=f"❓ **Commande inconnue:** `{command}`\n\nUtilisez `/help` pour voir les commandes disponibles.").send()
+    await handler(*args)
 
-async def show_status():
+@lru_cache(maxsize=256)
+def _document_meta(doc_name: str) -> Tuple[str, Optional[DocumentConfig]]:
+    """Returns (company name, document config or None) for a document, memoized per name"""
+    config = get_config()
+    try:
+        doc_config = config.get_document_by_name(doc_name)
+    except ValueError:
+        doc_config = None
+    return config.get_company_name(doc_name), doc_config
+
+def _document_line(doc_name: str, company_name: str) -> str:
+    """Formats one entry of the /documents list"""
+    doc_config = _document_meta(doc_name)[1]
+    if doc_config is None:
+        return f"- **{company_name}**: {doc_name}"
+    return f"- **{company_name}** ({doc_config.content_type}): {doc_config.description}"
+
+# Last status dict rendered by render_status_md and its Markdown. The status cache hands out the
+# same dict object until it refreshes, so an identity check is enough to reuse the rendering
+_rendered_status: Tuple[Optional[Dict], str] = (None, "")
+
+def render_status_md(status: Dict) -> str:
     """
-    Displays the current system status in the Chainlit chat, including LLM, vector store, and document health.
-    Retrieves status information asynchronously and sends a formatted status message to the user.
+    Renders the /status message for a system status dict, reusing the previous rendering
+    when called again with the same (cached) status object.
+
+    Args:
+        status (Dict): The system status, as returned by LLMInterface.get_system_status.
 
     Returns:
-        None
+        str: The Markdown status message.
     """
-    loop = asyncio.get_event_loop()
-    status = await loop.run_in_executor(None, llm_interface.get_system_status)
+    global _rendered_status
+    cached_status, rendered = _rendered_status
+    if cached_status is status:
+        return rendered
+
+    config = get_config()
     
     # Ollama status
     ollama_chat = "✅ Connecté" if status['ollama_chat'] else "❌ Déconnecté"
@@ -176,71 +353,89 @@ async def show_status():
     vector_stats = status.get('vector_store', {})
     
     # Documents status
-    doc_details = []
-    for doc_name, doc_info in status['documents'].items():
-        company_name = config.get_company_name(doc_name)
-        pdf_status = "✅" if doc_info['pdf_exists'] else "❌"
-        json_status = "✅" if doc_info['json_exists'] else "❌"
-        doc_details.append(f"   - **{company_name}**: PDF {pdf_status} | Traité {json_status}")
+    doc_details = "\n".join(
+        f"   - **{_document_meta(doc_name)[0]}**: "
+        f"PDF {'✅' if doc_info['pdf_exists'] else '❌'} | Traité {'✅' if doc_info['json_exists'] else '❌'}"
+        for doc_name, doc_info in status['documents'].items()
+    )
     
-    status_message = f"""# 📊 Statut détaillé du système
+    rendered = STATUS_TEMPLATE.format(
+        chat_model=config.models.chat_model,
+        ollama_chat=ollama_chat,
+        embedding_model=config.models.embedding_model,
+        ollama_embed=ollama_embed,
+        total_collections=vector_stats.get('total_collections', 0),
+        total_documents=vector_stats.get('total_documents', 0),
+        total_chunks=vector_stats.get('total_chunks', 0),
+        doc_details=doc_details,
+        chunk_size=config.vector_store.chunk_size,
+        overlap=config.vector_store.overlap,
+        temperature=config.models.temperature,
+    )
+    _rendered_status = (status, rendered)
+    return rendered
 
-## 🤖 Ollama:
-- **Modèle de chat** ({config.models.chat_model}): {ollama_chat}
-- **Modèle d'embeddings** ({config.models.embedding_model}): {ollama_embed}
-
-## 🔍 Base vectorielle:
-- **Collections**: {vector_stats.get('total_collections', 0)}
-- **Documents indexés**: {vector_stats.get('total_documents', 0)}
-- **Chunks totaux**: {vector_stats.get('total_chunks', 0)}
-
-## 📚 Documents:
-{chr(10).join(doc_details)}
+async def show_status():
+    """
+    Displays the current system status in the Chainlit chat, including LLM, vector store, and document health.
+    Retrieves status information asynchronously and sends a formatted status message to the user.
 
-## ⚙️ Configuration:
-- **Taille des chunks**: {config.vector_store.chunk_size}
-- **Chevauchement**: {config.vector_store.overlap}
-- **Température LLM**: {config.models.temperature}
-"""
-    
-    await cl.Message(content=status_message).send()
+    Returns:
+        None
+    """
+    status = await system_status_cache.get()
+    await send_diagnostic(render_status_md(status))
 
-async def show_documents():
+async def show_documents(*filters: str):
     """
     Displays the list of available documents in the Chainlit chat.
     Retrieves document information asynchronously and sends a formatted list to the user.
 
+    Args:
+        *filters (str): Optional words; only documents whose name or company contains one of them are listed.
+
     Returns:
         None
     """
-    loop = asyncio.get_event_loop()
-    available_docs = await loop.run_in_executor(None, llm_interface.get_available_documents)
+    available_docs = await available_documents_cache.get()
 
     if not available_docs:
-        await cl.Message(content="❌ **Aucun document disponible**\n\nUtilisez `/process` pour traiter les documents.").send()
+        await send_diagnostic("❌ **Aucun document disponible**\n\nUtilisez `/process` pour traiter les documents.")
         return
 
-    doc_list = []
-    for doc_name, company_name in available_docs.items():
-        # Get document config for more info
-        try:
-            doc_config = config.get_document_by_name(doc_name)
-            doc_list.append(f"- **{company_name}** ({doc_config.content_type}): {doc_config.description}")
-        except Exception:
-            doc_list.append(f"- **{company_name}**: {doc_name}")
-
-    message = f"""# 📚 Documents disponibles
+    if filters:
+        terms = [term.lower() for term in filters]
+        available_docs = {
+            doc_name: company_name for doc_name, company_name in available_docs.items()
+            if any(term in doc_name.lower() or term in company_name.lower() for term in terms)
+        }
+        if not available_docs:
+            await send_diagnostic(f"❌ **Aucun document ne correspond à:** `{' '.join(filters)}`")
+            return
 
-{chr(10).join(doc_list)}
+    doc_list = "\n".join(_document_line(doc_name, company_name) for doc_name, company_name in available_docs.items())
 
-💡 **Astuce:** Vous pouvez mentionner un restaurant spécifique dans votre question pour obtenir des informations ciblées, ou poser une question générale pour comparer les options.
-"""
+    message = DOCUMENTS_TEMPLATE.format(doc_list=doc_list)
 
-    await cl.Message(content=message).send()
+    await send_diagnostic(message)
 
 async def process_documents():
     """
     Processes all documents in the system and updates the vector store.
+    Only one run happens at a time: a /process sent while another is in progress is rejected.
+
+    Returns:
+        None
+    """
+    if _process_lock.locked():
+        await cl.Message(content="⏳ **Traitement déjà en cours...**\n\nMerci de patienter jusqu'à la fin du traitement actuel.").send()
+        return
+
+    async with _process_lock:
+        await _run_processing()
+
+async def _run_processing():
+    """
     Runs document processing asynchronously, updates system status, and sends feedback messages to the user.
 
     Returns:
@@ -250,8 +445,23 @@ async def process_documents():
     await processing_msg.send()
 
     try:
-        # Run processing in background
-        success = await asyncio.get_event_loop().run_in_executor(None, pipeline.process_all_documents)
+        # Run processing in background; the pipeline reports each finished document
+        # from its thread and the updates are streamed into the processing message
+        loop = asyncio.get_running_loop()
+        progress: asyncio.Queue = asyncio.Queue()
+
+        def report(current: int, total: int, name: str):
+            loop.call_soon_threadsafe(progress.put_nowait, (current, total, name))
+
+        task = loop.run_in_executor(PROCESSING_POOL, lambda: get_pipeline().process_all_documents(progress_callback=report))
+        # Queued after every progress update, since the thread reports before it returns
+        task.add_done_callback(lambda _: progress.put_nowait(None))
+
+        while (item := await progress.get()) is not None:
+            current, total, name = item
+            await processing_msg.stream_token(f"\n✅ {_document_meta(name)[0]} ({current}/{total})")
+
+        success = await task
 
         # Remove processing message
         try:
@@ -260,9 +470,17 @@ async def process_documents():
             pass  # Ignore if already removed
 
         if success:
-            # Update system status
-            status = llm_interface.get_system_status()
-            cl.user_session.set("system_status", status)
+            # Update system status (processing changed it, so drop the cached copies)
+            system_status_cache.invalidate()
+            available_documents_cache.invalidate()
+            _document_meta.cache_clear()
+            # Cached answers were built from the previous vector store contents
+            get_llm_interface().refresh_answer_cache()
+            status, available_docs = await asyncio.gather(
+                system_status_cache.get(),
+                available_documents_cache.get(),
+            )
+            await store_session_data(status, available_docs)
 
             status_msg = f"""✅ **Documents traités avec succès!**
 
@@ -286,32 +504,16 @@ Le système est prêt à répondre à vos questions! 🎉"""
 
 async def show_help():
     """Show help message"""
-    help_message = """# 🆘 Aide - Pizzeria RAG
-
-## 💬 Questions normales:
-Posez simplement votre question en français!
-- "Quelles pizzas avez-vous?"
-- "Prix de la Margherita?"
-- "Options végétariennes chez Marco Fuso?"
-
-## 🔧 Commandes spéciales:
-- `/status` - Statut détaillé du système
-- `/documents` - Liste des documents disponibles  
-- `/process` - Traiter/retraiter les documents
-- `/help` - Afficher cette aide
-
-## 💡 Conseils:
-- Mentionnez un restaurant spécifique pour des résultats ciblés
-- Posez des questions générales pour comparer les options
-- Soyez spécifique dans vos questions pour de meilleurs résultats
-
-## 🔧 En cas de problème:
-1. Vérifiez que Ollama fonctionne: `ollama serve`
-2. Traitez les documents: `/process`
-3. Vérifiez le statut: `/status`
-"""
-    
-    await cl.Message(content=help_message).send()
+    await send_diagnostic(HELP_MSG)
+
+# Slash command name -> handler, called with the words typed after the command
+# (commands that take no arguments ignore them)
+_COMMANDS = {
+    "/status": lambda *args: show_status(),
+    "/documents": show_documents,
+    "/process": lambda *args: process_documents(),
+    "/help": lambda *args: show_help(),
+}
 
 if __name__ == "__main__":
     logger.info("🍕 Starting Chainlit Pizzeria RAG App")
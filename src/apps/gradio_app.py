@@ -1,67 +1,124 @@
 import gradio as gr
+import asyncio
 import logging
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import AsyncIterator, List, Tuple
 
-# Add project root to path
-project_root = Path(__file__).parent.parent.parent
-sys.path.append(str(project_root))
+# Make the project root importable when run as a script from a source checkout
+# (not needed once installed with `pip install -e .`); never added twice
+_project_root = str(Path(__file__).resolve().parents[2])
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
 
-from config.config import config
-from src.core.rag_engine import LLMInterface
-from src.core.pipeline import Pipeline
+# The LLM interface is created on first use so the UI starts without waiting for
+# Chroma/Ollama initialization; the lock stops concurrent first calls from building twice
+_init_lock = threading.Lock()
 
-# Initialize components
-pipeline = Pipeline()
-llm_interface = LLMInterface()
+@lru_cache(maxsize=1)
+def _create_llm_interface():
+    from src.core.rag_engine import LLMInterface
+    return LLMInterface()
+
+def get_llm_interface():
+    """Returns the shared LLMInterface, creating it on first use"""
+    with _init_lock:
+        return _create_llm_interface()
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def get_bot_response(history: List) -> List:
+# Number of chat answers generated in parallel, and how many requests may wait in the queue
+CHAT_CONCURRENCY = 4
+QUEUE_MAX_SIZE = 32
+
+# Blocking RAG/Ollama calls run here, one thread per concurrent chat
+IO_POOL = ThreadPoolExecutor(max_workers=CHAT_CONCURRENCY, thread_name_prefix="rag-io")
+
+# Sentinel returned by next() once an answer stream is exhausted
+_STREAM_END = object()
+
+# Custom CSS for better styling
+CUSTOM_CSS = """
+.gradio-container {
+    max-width: 1200px !important;
+    margin: 0 auto !important;
+}
+
+.chat-container {
+    height: 600px !important;
+}
+
+.input-container {
+    max-width: 800px !important;
+}
+
+.status-container {
+    background-color: #f8f9fa;
+    border-radius: 10px;
+    padding: 15px;
+    margin: 10px 0;
+}
+
+.header-title {
+    text-align: center;
+    color: #2c3e50;
+    margin-bottom: 20px;
+}
+
+.tab-nav {
+    background-color: #34495e;
+}
+
+.tab-nav button {
+    color: white !important;
+}
+
+.tab-nav button.selected {
+    background-color: #3498db !important;
+}
+"""
+
+async def get_bot_response(history: List) -> AsyncIterator[List]:
     """
-    Processes the latest user message in the Gradio chat history and generates a bot response.
-    Answers the user's question using the RAG pipeline and appends the assistant's reply to the chat history.
+    Processes the latest user message in the Gradio chat history and streams the bot response.
+    Answers the user's question using the RAG pipeline, yielding the chat history each time the
+    assistant's reply grows so tokens appear in the UI as they are generated.
+    The blocking retrieval and Ollama calls run on IO_POOL so the Gradio worker stays free.
 
     Args:
         history (List): The chat history containing user and assistant messages.
 
-    Returns:
-        List: The updated chat history including the assistant's response.
+    Yields:
+        List: The chat history including the assistant's response so far.
     """
     if not history or history[-1]["role"] != "user":
-        return history
+        yield history
+        return
     
     question = history[-1]["content"]
     
+    # Add an empty assistant message that is filled in as the answer streams
+    history.append({"role": "assistant", "content": ""})
+    
     try:
-        result = llm_interface.answer_question(question)
+        loop = asyncio.get_running_loop()
+        tokens = await loop.run_in_executor(IO_POOL, lambda: get_llm_interface().stream_answer(question))
         
-        if result['status'] == 'success':
-            response = result['answer']
-            
-            # Log context information for debugging (not shown to user)
-            if result['has_context']:
-                if result['has_multiple_companies']:
-                    companies = ", ".join(result['companies_found'])
-                    logger.info(f"📊 Multi-company response - Sources: {companies}")
-                else:
-                    companies = ", ".join(result['companies_found']) if result['companies_found'] else "nos documents"
-                    logger.info(f"📄 Single-company response - Source: {companies}")
-            else:
-                logger.info("⚠️ No specific context found in documents")
-        else:
-            response = f"❌ Désolé, une erreur s'est produite: {result.get('answer', 'Erreur inconnue')}"
+        # Each token is pulled from the blocking generator on the pool
+        while (token := await loop.run_in_executor(IO_POOL, next, tokens, _STREAM_END)) is not _STREAM_END:
+            history[-1]["content"] += token
+            yield history
             
     except Exception as e:
         logger.error(f"Error processing question: {e}")
-        response = f"❌ Erreur lors du traitement: {str(e)}"
+        history[-1]["content"] = f"❌ Erreur lors du traitement: {str(e)}"
     
-    # Add assistant response
-    history.append({"role": "assistant", "content": response})
-    return history
+    yield history
 
 def add_user_message(message: str, history: List) -> Tuple[str, List]:
     """Add user message to chat history and clear input"""
@@ -72,48 +129,7 @@ def add_user_message(message: str, history: List) -> Tuple[str, List]:
 def create_interface():
     """Create and configure the Gradio interface"""
     
-    # Custom CSS for better styling
-    custom_css = """
-    .gradio-container {
-        max-width: 1200px !important;
-        margin: 0 auto !important;
-    }
-    
-    .chat-container {
-        height: 600px !important;
-    }
-    
-    .input-container {
-        max-width: 800px !important;
-    }
-    
-    .status-container {
-        background-color: #f8f9fa;
-        border-radius: 10px;
-        padding: 15px;
-        margin: 10px 0;
-    }
-    
-    .header-title {
-        text-align: center;
-        color: #2c3e50;
-        margin-bottom: 20px;
-    }
-    
-    .tab-nav {
-        background-color: #34495e;
-    }
-    
-    .tab-nav button {
-        color: white !important;
-    }
-    
-    .tab-nav button.selected {
-        background-color: #3498db !important;
-    }
-    """
-    
-    with gr.Blocks(css=custom_css, title="🍕 Pizzeria RAG Assistant", theme=gr.themes.Soft()) as interface: # type: ignore
+    with gr.Blocks(css=CUSTOM_CSS, title="🍕 Pizzeria RAG Assistant", theme=gr.themes.Soft()) as interface: # type: ignore
         
         # Header
         gr.HTML("""
@@ -165,7 +181,8 @@ def create_interface():
                 ).then(
                     get_bot_response,
                     inputs=[chatbot],
-                    outputs=[chatbot]
+                    outputs=[chatbot],
+                    concurrency_limit=CHAT_CONCURRENCY
                 )
                 
                 msg.submit(
@@ -175,7 +192,8 @@ def create_interface():
                 ).then(
                     get_bot_response,
                     inputs=[chatbot],
-                    outputs=[chatbot]
+                    outputs=[chatbot],
+                    concurrency_limit=CHAT_CONCURRENCY
                 )
             
             # Help Tab
@@ -216,6 +234,12 @@ def main():
     
     interface = create_interface()
     
+    # Warm up the RAG components in the background while the UI starts
+    threading.Thread(target=get_llm_interface, name="rag-warmup", daemon=True).start()
+    
+    # Let several users' answers be generated at once instead of one at a time
+    interface.queue(default_concurrency_limit=CHAT_CONCURRENCY, max_size=QUEUE_MAX_SIZE)
+    
     # Launch with custom settings
     interface.launch(
         server_name="0.0.0.0",
@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+
+# Default number of answers kept, and the cosine similarity above which two questions share an answer
+ANSWER_CACHE_SIZE = 256
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Cosine similarity above which a question reuses the retrieved context (but not the answer) of a previous one
+CONTEXT_REUSE_THRESHOLD = 0.85
+
+
+class AnswerCache:
+    """
+    Caches generated answers so repeated or near-duplicate questions skip retrieval and the LLM call.
+    Lookups go through two tiers: an exact match on the normalized question text, then a semantic
+    match comparing the question's embedding against those of previously answered questions.
+    A semantic match below the answer threshold but above the context threshold lets a related
+    question reuse the earlier retrieved context, so only the LLM call is repeated.
+
+    Entries are scoped by the searched documents and the user's allergens, since both change the answer,
+    and the least recently used entry is evicted once the cache is full. The cache can be saved to and
+    reloaded from disk between sessions. All methods are thread-safe.
+    """
+
+    def __init__(self, maxsize: int = ANSWER_CACHE_SIZE, threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 context_threshold: float = CONTEXT_REUSE_THRESHOLD):
+        """
+        Initializes an empty AnswerCache.
+
+        Args:
+            maxsize (int, optional): Maximum number of cached answers. Defaults to ANSWER_CACHE_SIZE.
+            threshold (float, optional): Minimum cosine similarity for a semantic hit. Defaults to SEMANTIC_CACHE_THRESHOLD.
+            context_threshold (float, optional): Minimum cosine similarity to reuse a cached context.
+                Defaults to CONTEXT_REUSE_THRESHOLD.
+        """
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.context_threshold = context_threshold
+        # Lookup outcomes since startup, to judge how often the cache pays off
+        self._stats = {"exact": 0, "similar": 0, "context": 0, "miss": 0}
+        # (scope, normalized question) -> (unit embedding or None, result)
+        self._entries: "OrderedDict[Tuple, Tuple[Optional[np.ndarray], Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def scope(document_names: Optional[Union[str, List[str]]], user_allergens: Optional[Sequence[str]]) -> Tuple:
+        """Builds the hashable scope an answer is valid for (searched documents and user allergens)"""
+        if isinstance(document_names, str):
+            document_names = [document_names]
+        return (tuple(sorted(document_names or ())), tuple(sorted(user_allergens or ())))
+
+    @staticmethod
+    def _normalize(question: str) -> str:
+        """Normalizes a question for exact matching (case and whitespace insensitive)"""
+        return " ".join(question.lower().split())
+
+    @staticmethod
+    def _unit(embedding: Optional[Sequence[float]]) -> Optional[np.ndarray]:
+        """Returns the L2-normalized embedding, or None if it is missing or all zeros (failed embedding)"""
+        if embedding is None:
+            return None
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if not norm:
+            return None
+        return vector / norm
+
+    def get_exact(self, scope: Tuple, question: str) -> Optional[Dict]:
+        """
+        Looks up an answer for the same question (ignoring case and spacing) in the given scope.
+
+        Args:
+            scope (Tuple): The scope from AnswerCache.scope.
+            question (str): The user's question.
+
+        Returns:
+            Optional[Dict]: The cached result, or None on a miss.
+        """
+        key = (scope, self._normalize(question))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self._stats["exact"] += 1
+            return entry[1]
+
+    def get_similar(self, scope: Tuple, embedding: Optional[Sequence[float]]) -> Tuple[Optional[Dict], bool]:
+        """
+        Looks up the result of the most similar previous question in the given scope.
+
+        Args:
+            scope (Tuple): The scope from AnswerCache.scope.
+            embedding (Optional[Sequence[float]]): The question's embedding.
+
+        Returns:
+            Tuple[Optional[Dict], bool]: The cached result, or None if no question reaches the context threshold,
+                and whether its answer can be reused as is (similarity at or above the answer threshold);
+                otherwise only its context should be reused.
+        """
+        unit = self._unit(embedding)
+        with self._lock:
+            keys = [key for key, (vector, _) in self._entries.items() if key[0] == scope and vector is not None]
+            if unit is None or not keys:
+                self._stats["miss"] += 1
+                return None, False
+            # Vectors are stored normalized, so one matrix-vector product gives every cosine similarity
+            similarities = np.vstack([self._entries[key][0] for key in keys]) @ unit
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.context_threshold:
+                self._stats["miss"] += 1
+                return None, False
+            reuse_answer = bool(similarities[best] >= self.threshold)
+            self._stats["similar" if reuse_answer else "context"] += 1
+            self._entries.move_to_end(keys[best])
+            return self._entries[keys[best]][1], reuse_answer
+
+    def put(self, scope: Tuple, question: str, embedding: Optional[Sequence[float]], result: Dict):
+        """
+        Stores an answer, evicting the least recently used one if the cache is full.
+
+        Args:
+            scope (Tuple): The scope from AnswerCache.scope.
+            question (str): The user's question.
+            embedding (Optional[Sequence[float]]): The question's embedding, or None to only allow exact hits.
+            result (Dict): The result to cache.
+        """
+        key = (scope, self._normalize(question))
+        with self._lock:
+            self._entries[key] = (self._unit(embedding), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns how many lookups were exact hits, similar hits, context reuses and misses since startup"""
+        with self._lock:
+            return dict(self._stats)
+
+    def clear(self):
+        """Drops every cached answer (e.g. after the documents were reprocessed)"""
+        with self._lock:
+            self._entries.clear()
+
+    def save(self, path: Path, stamp: str):
+        """
+        Writes the cached answers to disk (embeddings as one float32 matrix, the rest as JSON), atomically.
+
+        Args:
+            path (Path): The .npz file to write.
+            stamp (str): Identifies the indexed documents the answers were built from; load ignores
+                the file if it no longer matches.
+        """
+        with self._lock:
+            items = list(self._entries.items())
+        if not items:
+            return
+        dimension = next((len(vector) for _, (vector, _) in items if vector is not None), 0)
+        # Entries without an embedding (exact-match only) get a zero row and has_vector=False
+        vectors = np.zeros((len(items), dimension), dtype=np.float32)
+        entries = []
+        for row, ((scope, question), (vector, result)) in enumerate(items):
+            has_vector = vector is not None and len(vector) == dimension
+            if has_vector:
+                vectors[row] = vector
+            entries.append([[list(part) for part in scope], question, has_vector, result])
+
+        payload = np.array(json.dumps(entries))
+        # Written next to the target then renamed over it, so a crash never leaves a truncated cache
+        tmp_path = path.with_name(path.name + ".tmp.npz")
+        try:
+            np.savez(tmp_path, vectors=vectors, entries=payload, stamp=np.array(stamp))
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def load(self, path: Path, stamp: str) -> int:
+        """
+        Restores answers saved by save, oldest first so the recency order is kept.
+
+        Args:
+            path (Path): The .npz file to read.
+            stamp (str): The current stamp of the indexed documents; a file saved with another one is ignored.
+
+        Returns:
+            int: The number of answers restored.
+        """
+        with np.load(path) as data:
+            if str(data['stamp']) != stamp:
+                return 0
+            vectors = data['vectors']
+            entries = json.loads(str(data['entries']))
+
+        with self._lock:
+            for row, (scope, question, has_vector, result) in enumerate(entries):
+                key = (tuple(tuple(part) for part in scope), question)
+                self._entries[key] = (vectors[row] if has_vector else None, result)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return len(self._entries)
@@ -0,0 +1,80 @@
+import hashlib
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+
+class EmbeddingCache:
+    """
+    Persists chunk embeddings in SQLite, keyed by a SHA-256 hash of the embedding model and chunk text.
+    Rebuilding the vector store then only embeds chunks whose text (or model) changed; an edited chunk
+    gets a new hash, so stale vectors are never returned and no explicit invalidation is needed.
+
+    Vectors are stored as packed float32. The connection is shared between threads behind a lock.
+    """
+
+    # SQLite limits the number of bound parameters per statement
+    _LOOKUP_BATCH_SIZE = 500
+
+    def __init__(self, db_path: Path, model: str):
+        """
+        Opens (creating it if needed) the cache database.
+
+        Args:
+            db_path (Path): Path of the SQLite database file.
+            model (str): Name of the embedding model; part of every key.
+        """
+        self.model = model
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)")
+        self._conn.commit()
+
+    def key(self, text: str) -> bytes:
+        """Returns the cache key for a chunk of text embedded with this cache's model"""
+        return hashlib.sha256(f"{self.model}\0{text}".encode('utf-8')).digest()
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, List[float]]:
+        """
+        Looks up cached embeddings.
+
+        Args:
+            keys (Sequence[bytes]): Keys from EmbeddingCache.key.
+
+        Returns:
+            Dict[bytes, List[float]]: The embeddings found, by key (misses are absent).
+        """
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), self._LOOKUP_BATCH_SIZE):
+                batch = keys[start:start + self._LOOKUP_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE hash IN ({placeholders})", list(batch)
+                )
+                for key, blob in rows:
+                    found[key] = array('f', blob).tolist()
+        return found
+
+    def put_many(self, items: Dict[bytes, Sequence[float]]):
+        """
+        Stores embeddings in a single transaction.
+
+        Args:
+            items (Dict[bytes, Sequence[float]]): Embeddings by key.
+        """
+        if not items:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, vec) VALUES (?, ?)",
+                [(key, array('f', vector).tobytes()) for key, vector in items.items()]
+            )
+
+    def close(self):
+        """Closes the database connection"""
+        with self._lock:
+            self._conn.close()
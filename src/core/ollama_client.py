@@ -0,0 +1,35 @@
+from functools import lru_cache
+import httpx
+import ollama
+from config.config import config
+
+# Idle connections to Ollama are kept open this long (seconds); httpx's default of 5 s
+# closes them between two questions, so every question paid for a new connection
+KEEPALIVE_EXPIRY = 30.0
+
+# Connection pool shared by the chat, streaming and embedding calls of every thread
+MAX_KEEPALIVE_CONNECTIONS = 40
+MAX_CONNECTIONS = 100
+
+# Generation can take minutes on CPU, but an unreachable server should fail fast
+REQUEST_TIMEOUT = 300.0
+CONNECT_TIMEOUT = 10.0
+
+
+@lru_cache(maxsize=None)
+def get_client() -> ollama.Client:
+    """
+    Returns the Ollama client shared by the whole process, created on first use.
+    Its connection pool keeps connections to the Ollama server alive between requests,
+    so chat and embedding calls reuse them instead of reconnecting each time.
+
+    Returns:
+        ollama.Client: The shared client (thread-safe).
+    """
+    return ollama.Client(
+        host=config.models.ollama_host,
+        timeout=httpx.Timeout(REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                            max_connections=MAX_CONNECTIONS,
+                            keepalive_expiry=KEEPALIVE_EXPIRY)
+    )
@@ -1,16 +1,40 @@
 import logging
 import argparse
+import atexit
+import queue
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-# Add project root to path
-sys.path.append(str(Path(__file__).parent.parent.parent))
+# Make the project root importable when run as a script from a source checkout
+# (not needed once installed with `pip install -e .`); never added twice
+_project_root = str(Path(__file__).resolve().parents[2])
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
 
-from config.config import config
-from processors.document_processor import DocumentProcessor
-from src.core.vector_store import VectorStore  
-from src.core.rag_engine import LLMInterface
+from config.config import get_config
+
+# The components (and PyMuPDF, ChromaDB, Ollama behind them) are imported on first use, so commands
+# like --help, or ones answered by the daemon, do not pay for loading them
+if TYPE_CHECKING:
+    from processors.document_processor import DocumentProcessor, ProgressCallback
+    from src.core.vector_store import VectorStore
+    from src.core.rag_engine import LLMInterface
+
+# CLI log files, in the configuration's logs folder; the daemon keeps its own so records it sends back
+# to a client (which logs them again) are not written twice to the same file
+LOG_FILE = Path("logs") / "pipeline.log"
+DAEMON_LOG_FILE = Path("logs") / "pipeline-daemon.log"
+
+# Sample questions asked by test_system
+TEST_QUESTIONS = (
+    "Quelles pizzas avez-vous au menu?",
+    "Quel est le prix de la pizza Margherita?",
+    "Avez-vous des pizzas végétariennes?",
+)
 
 class Pipeline:
     """
@@ -23,40 +47,124 @@ class Pipeline:
     
     def __init__(self):
         """
-        Initializes the Pipeline with logging, document processor, vector store, and LLM interface.
-        Sets up the main components required for document processing and querying.
+        Initializes the Pipeline with logging.
+        The document processor, vector store, and LLM interface are created on first use, so a
+        command only pays for the components it actually needs.
         """
         self.logger = logging.getLogger(__name__)
-        self.processor = DocumentProcessor()
-        self.vector_store = VectorStore()
-        self.llm_interface = LLMInterface()
+        self._processor: Optional["DocumentProcessor"] = None
+        self._vector_store: Optional["VectorStore"] = None
+        self._llm_interface: Optional["LLMInterface"] = None
+        # Serializes component creation so threads racing on first use share one instance;
+        # reentrant because the LLM interface is built from the vector store
+        self._components_lock = threading.RLock()
+    
+    @property
+    def processor(self) -> "DocumentProcessor":
+        """The document processor, imported and created on first access"""
+        if self._processor is None:
+            with self._components_lock:
+                if self._processor is None:
+                    from processors.document_processor import DocumentProcessor
+                    self._processor = DocumentProcessor()
+        return self._processor
     
-    def process_all_documents(self) -> bool:
+    @property
+    def vector_store(self) -> "VectorStore":
+        """The vector store, imported and opened on first access"""
+        if self._vector_store is None:
+            with self._components_lock:
+                if self._vector_store is None:
+                    from src.core.vector_store import VectorStore
+                    self._vector_store = VectorStore()
+        return self._vector_store
+    
+    @property
+    def llm_interface(self) -> "LLMInterface":
+        """The LLM interface, imported and created on first access and sharing the pipeline's vector store"""
+        if self._llm_interface is None:
+            with self._components_lock:
+                if self._llm_interface is None:
+                    from src.core.rag_engine import LLMInterface
+                    self._llm_interface = LLMInterface(vector_store=self.vector_store)
+        return self._llm_interface
+    
+    def _refresh_cached_answers(self):
+        """Drops cached answers if the vector store contents changed, when the LLM interface was created"""
+        if self._llm_interface is not None:
+            self._llm_interface.refresh_answer_cache()
+    
+    def process_all_documents(self, progress_callback: Optional["ProgressCallback"] = None, force: bool = False) -> bool:
         """
         Processes all documents through the complete pipeline and updates the vector store.
+        The two steps overlap: each document is handed to the vector store as soon as its PDF is
+        processed, so embedding runs while the remaining PDFs are still being extracted.
         Returns True if all documents are successfully processed and added to the vector store.
 
+        Args:
+            progress_callback (Optional[ProgressCallback], optional): Called with (current, total, name)
+                after each document finishes a step; the total covers both steps. Defaults to None.
+            force (bool, optional): Reprocess and re-index documents even if unchanged. Defaults to False.
+
         Returns:
             bool: True if all documents are processed and added successfully, False otherwise.
         """
         self.logger.info("🚀 Starting complete pipeline for all documents...")
         
-        # Step 1: Process PDFs to JSON
-        self.logger.info("📄 Step 1: Processing PDFs to structured JSON...")
-        processing_results = self.processor.process_all_documents()
+        # Each document goes through two steps, so progress runs from 1 to 2 x documents
+        total_docs = len(get_config().documents)
+        step_one = None
+        if progress_callback is not None:
+            step_one = lambda current, total, name: progress_callback(current, 2 * total_docs, name)
         
-        # Step 2: Add to vector store
-        self.logger.info("🔍 Step 2: Adding documents to vector store...")
-        vector_results = self.vector_store.add_all_documents()
+        # Documents finished by step 1 and not yet picked up by the indexing thread
+        ready: List[Tuple[str, bool]] = []
+        ready_lock = threading.Lock()
+        # Outcomes are counted as documents finish, so no result dict has to be walked afterwards
+        processed_success = indexed = vector_success = 0
         
-        # Summary
-        total_docs = len(config.documents)
-        processed_success = sum(1 for success in processing_results.values() if success)
-        vector_success = sum(1 for success in vector_results.values() if success)
+        def index_ready():
+            """Adds every document that is ready to the vector store in one call (runs on the indexing thread)"""
+            nonlocal indexed, vector_success
+            with ready_lock:
+                batch = ready[:]
+                ready.clear()
+            if not batch:
+                return
+            # Documents that finished together share embedding batches
+            processed = [name for name, success in batch if success]
+            added = self.vector_store.add_documents(processed, force=force) if processed else {}
+            for name, _ in batch:
+                indexed += 1
+                vector_success += added.get(name, False)
+                if progress_callback is not None:
+                    progress_callback(total_docs + indexed, 2 * total_docs, name)
         
-        self.logger.info(f"📊 Pipeline Summary:")
-        self.logger.info(f"   - PDF Processing: {processed_success}/{total_docs} successful")
-        self.logger.info(f"   - Vector Store: {vector_success}/{total_docs} successful")
+        # Open the vector store up front rather than lazily from the indexing thread
+        self.vector_store
+        
+        # Step 1: Process PDFs to JSON; Step 2 (adding to the vector store) starts as soon as documents
+        # are ready, on one thread so collections are written one at a time
+        self.logger.info("📄 Step 1: Processing PDFs to structured JSON...")
+        self.logger.info("🔍 Step 2: Adding documents to vector store as they are ready...")
+        index_futures: List[Future] = []
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="vector-store") as vector_pool:
+            def submit(name: str, success: bool):
+                nonlocal processed_success
+                processed_success += success
+                with ready_lock:
+                    ready.append((name, success))
+                index_futures.append(vector_pool.submit(index_ready))
+            
+            self.processor.process_all_documents(force=force, progress_callback=step_one, document_callback=submit)
+        for future in index_futures:
+            future.result()
+        self._refresh_cached_answers()
+        
+        # Summary
+        self.logger.info("📊 Pipeline Summary:")
+        self.logger.info("   - PDF Processing: %d/%d successful", processed_success, total_docs)
+        self.logger.info("   - Vector Store: %d/%d successful", vector_success, total_docs)
         
         return processed_success == total_docs and vector_success == total_docs
     
@@ -71,36 +179,37 @@ class Pipeline:
         Returns:
             bool: True if the document is processed and added successfully, False otherwise.
         """
-        self.logger.info(f"🚀 Starting pipeline for document: {document_name}")
+        self.logger.info("🚀 Starting pipeline for document: %s", document_name)
         
         try:
             # Validate document exists
-            doc_config = config.get_document_by_name(document_name)
+            doc_config = get_config().get_document_by_name(document_name)
             
             # Step 1: Process PDF to JSON
-            self.logger.info(f"📄 Step 1: Processing {document_name} PDF to JSON...")
+            self.logger.info("📄 Step 1: Processing %s PDF to JSON...", document_name)
             processing_success = self.processor.process_document_by_name(document_name)
             
             if not processing_success:
-                self.logger.error(f"❌ Failed to process {document_name}")
+                self.logger.error("❌ Failed to process %s", document_name)
                 return False
             
             # Step 2: Add to vector store
-            self.logger.info(f"🔍 Step 2: Adding {document_name} to vector store...")
+            self.logger.info("🔍 Step 2: Adding %s to vector store...", document_name)
             vector_success = self.vector_store.add_document(document_name)
             
             if not vector_success:
-                self.logger.error(f"❌ Failed to add {document_name} to vector store")
+                self.logger.error("❌ Failed to add %s to vector store", document_name)
                 return False
+            self._refresh_cached_answers()
             
-            self.logger.info(f"✅ Pipeline complete for {document_name}")
+            self.logger.info("✅ Pipeline complete for %s", document_name)
             return True
             
         except ValueError as e:
-            self.logger.error(f"❌ Document not found: {e}")
+            self.logger.error("❌ Document not found: %s", e)
             return False
         except Exception as e:
-            self.logger.error(f"❌ Pipeline error for {document_name}: {e}")
+            self.logger.error("❌ Pipeline error for %s: %s", document_name, e)
             return False
     
     def test_system(self, document_name: Optional[str] = None) -> Dict:
@@ -116,23 +225,18 @@ class Pipeline:
         """
         self.logger.info("🧪 Testing system...")
         
-        test_questions = [
-            "Quelles pizzas avez-vous au menu?",
-            "Quel est le prix de la pizza Margherita?",
-            "Avez-vous des pizzas végétariennes?"
-        ]
-        
-        results = []
+        test_questions = TEST_QUESTIONS
         
         for question in test_questions:
-            self.logger.info(f"Testing: {question}")
-            result = self.llm_interface.answer_question(question, document_names=document_name)
-            results.append(result)
-            
-            # Log result
+            self.logger.info("Testing: %s", question)
+        # Embedded in one batched call and asked concurrently
+        results = self.llm_interface.answer_questions(test_questions, document_names=document_name)
+        
+        # Log results once all are in, in question order
+        for question, result in zip(test_questions, results):
             status = "✅" if result['status'] == 'success' else "❌"
             context_status = "📄" if result['has_context'] else "📭"
-            self.logger.info(f"{status} {context_status} {question}")
+            self.logger.info("%s %s %s", status, context_status, question)
         
         return {
             "total_tests": len(test_questions),
@@ -166,71 +270,191 @@ class Pipeline:
         """
         try:
             # Add to configuration
-            doc_config = config.add_document(name, pdf_path, description)
-            self.logger.info(f"📝 Added new document config: {name}")
+            doc_config = get_config().add_document(name, pdf_path, description)
+            self.logger.info("📝 Added new document config: %s", name)
             
             # Process the document
             success = self.process_single_document(name)
             
             if success:
-                self.logger.info(f"✅ Successfully added new document: {name}")
+                self.logger.info("✅ Successfully added new document: %s", name)
             else:
-                self.logger.error(f"❌ Failed to add new document: {name}")
+                self.logger.error("❌ Failed to add new document: %s", name)
             
             return success
             
         except Exception as e:
-            self.logger.error(f"❌ Error adding new document {name}: {e}")
+            self.logger.error("❌ Error adding new document %s: %s", name, e)
             return False
 
+class _InProcessQueueHandler(QueueHandler):
+    """
+    QueueHandler for a queue drained in the same process: records are enqueued as they are, so even
+    message formatting happens on the listener thread instead of the logging caller's.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+def setup_logging(level: int = logging.INFO, log_file: Path = LOG_FILE) -> QueueListener:
+    """
+    Configures root logging so that log calls only enqueue records; a background listener thread
+    formats them and writes them to the console and the log file, keeping I/O off the processing path.
+    The listener is stopped (and the queue flushed) at interpreter exit.
+
+    Args:
+        level (int, optional): The root logging level. Defaults to logging.INFO.
+        log_file (Path, optional): The file logs are appended to. Defaults to LOG_FILE.
+
+    Returns:
+        QueueListener: The started listener.
+    """
+    log_queue = queue.SimpleQueue()
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    handlers: List[logging.Handler] = [console_handler]
+    
+    try:
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    except OSError as e:
+        sys.stderr.write(f"⚠️ Logging to console only, cannot write {log_file}: {e}\n")
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_InProcessQueueHandler(log_queue))
+    
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+def run_command(pipeline: Pipeline, command: str, document_name: Optional[str] = None, force: bool = False) -> Any:
+    """
+    Runs a CLI command against a pipeline and returns its raw result, for main() and the pipeline daemon.
+
+    Args:
+        pipeline (Pipeline): The pipeline to run the command on.
+        command (str): One of "process-all", "process-single", "test" or "status".
+        document_name (Optional[str], optional): The --document argument. Defaults to None.
+        force (bool, optional): The --force argument. Defaults to False.
+
+    Returns:
+        Any: The command's result (a success flag, test results, or the system status).
+    """
+    if command == "process-all":
+        return pipeline.process_all_documents(force=force)
+    if command == "process-single":
+        return pipeline.process_single_document(document_name) # type: ignore
+    if command == "test":
+        return pipeline.test_system(document_name)
+    if command == "status":
+        return pipeline.get_system_status()
+    raise ValueError(f"Unknown command: {command}")
+
+def _execute(args: argparse.Namespace) -> Any:
+    """Runs the parsed command on a running pipeline daemon if there is one (its pipeline is already warm), otherwise inline"""
+    from src.core import pipeline_daemon
+    
+    document_name = getattr(args, "document", None)
+    force = getattr(args, "force", False)
+    result = None
+    if not args.no_daemon:
+        result = pipeline_daemon.request(args.command, document_name, force,
+                                         level=logging.getLogger().getEffectiveLevel())
+    if result is None:
+        result = run_command(Pipeline(), args.command, document_name, force)
+    return result
+
+def cmd_process(args: argparse.Namespace) -> int:
+    """Handles process-all and process-single"""
+    return 0 if _execute(args) else 1
+
+def cmd_test(args: argparse.Namespace) -> int:
+    """Handles test: prints the test summary"""
+    test_results = _execute(args)
+    print(f"Test Results: {test_results['successful_tests']}/{test_results['total_tests']} successful")
+    print(f"Tests with context: {test_results['tests_with_context']}/{test_results['total_tests']}")
+    return 0 if test_results['successful_tests'] == test_results['total_tests'] else 1
+
+def cmd_status(args: argparse.Namespace) -> int:
+    """Handles status: prints the system status"""
+    status = _execute(args)
+    vector_store = status['vector_store']
+    documents = status['documents']
+    
+    lines = [
+        "System Status:",
+        f"  Ollama Chat: {'✅' if status['ollama_chat'] else '❌'}",
+        f"  Ollama Embeddings: {'✅' if status['ollama_embeddings'] else '❌'}",
+        f"  Vector Store Collections: {vector_store.get('total_collections', 0)}",
+        f"  Total Documents in Vector Store: {vector_store.get('total_documents', 0)}",
+        "  Document Status:",
+    ]
+    for doc_name, doc_status in documents.items():
+        pdf_status = "✅" if doc_status['pdf_exists'] else "❌"
+        json_status = "✅" if doc_status['json_exists'] else "❌"
+        lines.append(f"    {doc_name}: PDF {pdf_status} | JSON {json_status} | {doc_status['description']}")
+    # One write so the report is not interleaved with log output
+    sys.stdout.write("\n".join(lines) + "\n")
+    return 0
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    """Handles serve: runs the pipeline daemon until interrupted"""
+    from src.core import pipeline_daemon
+    
+    pipeline = Pipeline()
+    
+    def handle(command: str, document_name: Optional[str], force: bool) -> Any:
+        # PDFs may have been added or removed since the daemon started
+        get_config().refresh_documents()
+        return run_command(pipeline, command, document_name, force)
+    
+    pipeline_daemon.serve(handle)
+    return 0
+
 def main():
     """Main CLI interface"""
     parser = argparse.ArgumentParser(description="Modular Pizzeria RAG Pipeline")
-    parser.add_argument("--command", choices=["process-all", "process-single", "test", "status"], 
-                       required=True, help="Command to execute")
-    parser.add_argument("--document", help="Document name for single document operations")
-    parser.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
+    
+    # Options shared by every command
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
+    # Options of the commands that can be forwarded to a pipeline daemon
+    client = argparse.ArgumentParser(add_help=False, parents=[common])
+    client.add_argument("--no-daemon", action="store_true", help="Run inline even if a pipeline daemon is running")
+    
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+    
+    command = commands.add_parser("process-all", parents=[client], help="Process and index every document")
+    command.add_argument("--force", action="store_true", help="Reprocess and re-index documents even if unchanged")
+    command.set_defaults(func=cmd_process)
+    
+    command = commands.add_parser("process-single", parents=[client], help="Process and index one document")
+    command.add_argument("--document", required=True, help="Name of the document to process")
+    command.set_defaults(func=cmd_process)
+    
+    command = commands.add_parser("test", parents=[client], help="Ask sample questions")
+    command.add_argument("--document", help="Only search this document")
+    command.set_defaults(func=cmd_test)
+    
+    command = commands.add_parser("status", parents=[client], help="Show the system status")
+    command.set_defaults(func=cmd_status)
+    
+    command = commands.add_parser("serve", parents=[common], help="Run a daemon that keeps the pipeline warm for other commands")
+    command.set_defaults(func=cmd_serve)
     
     args = parser.parse_args()
     
     # Setup logging
-    log_level = logging.DEBUG if args.verbose else logging.INFO
-    logging.basicConfig(
-        level=log_level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    pipeline = Pipeline()
+    setup_logging(logging.DEBUG if args.verbose else logging.INFO,
+                  DAEMON_LOG_FILE if args.command == "serve" else LOG_FILE)
     
-    if args.command == "process-all":
-        success = pipeline.process_all_documents()
-        exit(0 if success else 1)
-    
-    elif args.command == "process-single":
-        if not args.document:
-            print("Error: --document required for process-single command")
-            exit(1)
-        success = pipeline.process_single_document(args.document)
-        exit(0 if success else 1)
-    
-    elif args.command == "test":
-        test_results = pipeline.test_system(args.document)
-        print(f"Test Results: {test_results['successful_tests']}/{test_results['total_tests']} successful")
-        print(f"Tests with context: {test_results['tests_with_context']}/{test_results['total_tests']}")
-        exit(0 if test_results['successful_tests'] == test_results['total_tests'] else 1)
-    
-    elif args.command == "status":
-        status = pipeline.get_system_status()
-        print("System Status:")
-        print(f"  Ollama Chat: {'✅' if status['ollama_chat'] else '❌'}")
-        print(f"  Ollama Embeddings: {'✅' if status['ollama_embeddings'] else '❌'}")
-        print(f"  Vector Store Collections: {status['vector_store'].get('total_collections', 0)}")
-        print(f"  Total Documents in Vector Store: {status['vector_store'].get('total_documents', 0)}")
-        print("  Document Status:")
-        for doc_name, doc_status in status['documents'].items():
-            pdf_status = "✅" if doc_status['pdf_exists'] else "❌"
-            json_status = "✅" if doc_status['json_exists'] else "❌"
-            print(f"    {doc_name}: PDF {pdf_status} | JSON {json_status} | {doc_status['description']}")
+    sys.exit(args.func(args))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,150 @@
+import logging
+import os
+import queue
+import socket
+from logging.handlers import QueueHandler
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+# Unix socket the daemon listens on; the CLI forwards its commands there when it exists
+SOCKET_ADDRESS = str(Path.home() / ".pizzeria-rag.sock")
+
+# Size of the random key the daemon writes next to its socket; clients must prove they can read it
+AUTHKEY_SIZE = 32
+
+# Runs a CLI command, called as handler(command, document_name, force)
+CommandHandler = Callable[[str, Optional[str], bool], Any]
+
+logger = logging.getLogger(__name__)
+
+
+def is_supported() -> bool:
+    """Returns True if the platform has Unix sockets (the daemon is not available on Windows)"""
+    return hasattr(socket, "AF_UNIX")
+
+
+def _authkey_path(address: str) -> str:
+    """Location of the daemon's authentication key for a socket address (readable by its owner only)"""
+    return address + ".key"
+
+
+def request(command: str, document_name: Optional[str] = None, force: bool = False,
+            level: int = logging.INFO, address: str = SOCKET_ADDRESS) -> Optional[Any]:
+    """
+    Forwards a CLI command to a running pipeline daemon and returns its result.
+    The command's log records are sent back and replayed through this process's logging.
+
+    Args:
+        command (str): The CLI command, e.g. "status".
+        document_name (Optional[str], optional): The --document argument. Defaults to None.
+        force (bool, optional): The --force argument. Defaults to False.
+        level (int, optional): The caller's logging level, applied to the command's logs. Defaults to logging.INFO.
+        address (str, optional): The daemon's socket. Defaults to SOCKET_ADDRESS.
+
+    Returns:
+        Optional[Any]: The command's result, or None if no daemon answered (the caller then runs it inline).
+    """
+    if not is_supported() or not os.path.exists(address):
+        return None
+    try:
+        with open(_authkey_path(address), 'rb') as f:
+            authkey = f.read()
+        # The key handshake happens before anything is sent, so only the daemon's owner can talk to it
+        with Client(address, family="AF_UNIX", authkey=authkey) as conn:
+            conn.send((command, document_name, force, level))
+            status, payload, records = conn.recv()
+    except (OSError, EOFError, AuthenticationError) as e:
+        logger.debug("Pipeline daemon unavailable at %s: %s", address, e)
+        return None
+
+    for record in records:
+        logging.getLogger(record.name).handle(record)
+
+    if status != "ok":
+        logger.warning("⚠️ Pipeline daemon failed to run '%s': %s", command, payload)
+        return None
+    return payload
+
+
+def _run_captured(handler: CommandHandler, command: str, document_name: Optional[str], force: bool,
+                  level: int) -> Tuple[Tuple[str, Any], List[logging.LogRecord]]:
+    """
+    Runs one command and collects the log records it emits at the client's level, so they can be sent back.
+
+    Returns:
+        Tuple[Tuple[str, Any], List[logging.LogRecord]]: The ("ok" or "error", result) reply and the
+            records, already formatted into plain messages so they can be pickled.
+    """
+    log_queue = queue.SimpleQueue()
+    capture = QueueHandler(log_queue)
+    capture.setLevel(level)
+    root = logging.getLogger()
+    previous_level = root.level
+    root.setLevel(min(previous_level, level))
+    root.addHandler(capture)
+    try:
+        reply = ("ok", handler(command, document_name, force))
+    except Exception as e:
+        logger.error("❌ Daemon command '%s' failed: %s", command, e)
+        reply = ("error", str(e))
+    finally:
+        root.removeHandler(capture)
+        root.setLevel(previous_level)
+
+    records = []
+    while not log_queue.empty():
+        records.append(log_queue.get_nowait())
+    return reply, records
+
+
+def serve(handler: CommandHandler, address: str = SOCKET_ADDRESS):
+    """
+    Runs the pipeline daemon: keeps one warm pipeline (vector store, Ollama connections, caches)
+    and answers CLI commands sent over a Unix socket, one at a time, until interrupted.
+    Each command's logs are captured at the client's level and returned along with its result.
+    The socket and a random key file are created readable by the current user only, and clients must
+    authenticate with that key before any command is unpickled.
+
+    Args:
+        handler (CommandHandler): Runs a command against the warm pipeline and returns its result.
+        address (str, optional): The socket to listen on. Defaults to SOCKET_ADDRESS.
+    """
+    if os.path.exists(address):
+        try:
+            with Client(address, family="AF_UNIX"):
+                raise RuntimeError(f"A pipeline daemon is already listening on {address}")
+        except (OSError, EOFError):
+            # Stale socket left behind by a daemon that did not shut down cleanly
+            os.unlink(address)
+
+    key_path = _authkey_path(address)
+    authkey = os.urandom(AUTHKEY_SIZE)
+    # Owner-only permissions from creation, so no other user can open the key or connect before a chmod
+    old_umask = os.umask(0o077)
+    try:
+        if os.path.exists(key_path):
+            os.unlink(key_path)
+        with open(key_path, 'wb') as f:
+            f.write(authkey)
+        listener = Listener(address, family="AF_UNIX", authkey=authkey)
+    finally:
+        os.umask(old_umask)
+
+    with listener:
+        logger.info("🛰️ Pipeline daemon listening on %s", address)
+        try:
+            while True:
+                try:
+                    with listener.accept() as conn:
+                        command, document_name, force, level = conn.recv()
+                        logger.info("📨 Daemon command: %s", command)
+                        (status, payload), records = _run_captured(handler, command, document_name, force, level)
+                        conn.send((status, payload, records))
+                except (OSError, EOFError, AuthenticationError) as e:
+                    logger.warning("⚠️ Daemon connection error: %s", e)
+        except KeyboardInterrupt:
+            logger.info("🛑 Pipeline daemon stopped")
+        finally:
+            os.unlink(key_path)
@@ -1,8 +1,211 @@
+import atexit
+import hashlib
 import logging
-from typing import Dict, List, Optional, Union
-import ollama
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from config.config import config
-from src.core.vector_store import VectorStore
+from src.core.answer_cache import AnswerCache
+from src.core.ollama_client import MAX_KEEPALIVE_CONNECTIONS, get_client
+from src.core.vector_store import INDEX_MANIFEST_FILE, VectorStore
+
+# First line of the offline fallback answer; such answers are never cached
+OFFLINE_HEADER = "🍕 Assistant Pizzeria (Mode Hors Ligne)"
+
+# Answer cache saved between sessions, next to the vector store
+ANSWER_CACHE_FILE = "answer_cache.npz"
+
+# Bumped whenever the cached result format changes, so older saved caches are discarded
+ANSWER_CACHE_VERSION = 1
+
+# Cache file -> the most recent LLMInterface using it; that one is saved at exit, once per file
+_answer_cache_owners: Dict[Path, "LLMInterface"] = {}
+_answer_cache_owners_lock = threading.Lock()
+
+# Words showing that a question mentions an allergy or a dietary restriction
+ALLERGEN_CONTEXT_INDICATORS = (
+    "allergique", "allergie", "allergies", "allergène", "allergènes",
+    "intolerance", "intolérant", "sans", "éviter", "peut pas manger",
+    "ne peux pas manger", "ne mange pas"
+)
+
+# Indicators strong enough that any allergen keyword in the question counts as the user's allergen
+STRONG_ALLERGEN_CONTEXT = ("allergique", "allergie", "sans", "éviter")
+
+# Restrictions that mark the allergen keyword directly following them as the user's allergen
+RESTRICTION_PREFIXES = (
+    "pas de ", "ne peut pas manger ", "ne peux pas manger ", "ne mange pas ",
+    "intolérant au ", "intolérant à ", "intolerance au ", "intolerance à ",
+    "peut pas manger de ", "ne peux pas manger de "
+)
+
+# Every (keyword, allergen) pair, flattened once in allergen order for the per-question scan
+ALLERGEN_KEYWORD_PAIRS = tuple(
+    (keyword, allergen)
+    for allergen, keywords in config.allergen.get_allergen_keywords().items()
+    for keyword in keywords
+)
+
+# Words that make a question allergen-related
+ALLERGEN_QUESTION_INDICATORS = (
+    "allergique", "allergie", "allergies", "allergène", "allergènes",
+    "intolerance", "intolérant", "sans", "éviter", "peut pas manger",
+    "gluten", "lactose", "végétalien", "vegan", "végétarien"
+)
+
+# Extracts the user's question back out of a prompt built from PROMPT_TEMPLATE
+PROMPT_QUESTION_RE = re.compile(r"QUESTION DU CLIENT: (.*?)(?:INSTRUCTIONS:|\Z)", re.DOTALL)
+
+# How long get_system_status reuses the result of its Ollama probes (seconds)
+HEALTH_CHECK_TTL = 30.0
+
+# Generation options for health probes: one token is enough to know the model answers
+PROBE_OPTIONS = {"num_predict": 1}
+
+# Start of the page label get_context puts before each context chunk
+CONTEXT_PAGE_PREFIX = "[Page "
+
+# Number of distinct context chunks whose detected allergens are remembered
+ALLERGEN_DETECTION_CACHE_SIZE = 4096
+
+# Questions answer_questions asks Ollama at once; more only queue behind OLLAMA_NUM_PARALLEL,
+# and staying well under the shared connection pool leaves room for the other callers
+MAX_PARALLEL_QUESTIONS = min(8, MAX_KEEPALIVE_CONNECTIONS // 4)
+
+# Static prompt parts, built once at import instead of on every question
+MULTI_COMPANY_ROLE = "Tu es un assistant du groupe de pizzerias. Nous avons plusieurs restaurants avec des menus différents."
+MULTI_COMPANY_INSTRUCTIONS = """INSTRUCTIONS:
+- Nous sommes un groupe de pizzerias avec plusieurs restaurants
+- Si la question est générale, présente les options de chaque restaurant séparément
+- Si un restaurant spécifique est mentionné, concentre-toi sur celui-ci
+- Sois précis sur quel restaurant offre quoi
+- Format: "Chez [Nom Restaurant]: [info]" pour chaque restaurant
+- PRIORITÉ ABSOLUE: TOUJOURS inclure les informations d'allergènes pour chaque pizza mentionnée
+- Si des allergènes sont détectés, AVERTIS CLAIREMENT le client avec des emojis ⚠️
+- Si le client mentionne des allergies spécifiques, VÉRIFIE LA COMPATIBILITÉ
+- Suggère des alternatives sans allergènes si nécessaire
+- Utilise le format: "⚠️ Allergènes: [liste]" ou "✅ Aucun allergène majeur détecté"
+- Reste dans le rôle d'un assistant de groupe de pizzerias"""
+
+SINGLE_COMPANY_ROLE = "Tu es un assistant de pizzeria. Réponds en français, sois précis et utile."
+SINGLE_COMPANY_INSTRUCTIONS = """INSTRUCTIONS:
+- Réponds uniquement en français
+- Base-toi uniquement sur les informations du contexte fourni
+- Si l'information n'est pas dans le contexte, dis-le clairement
+- PRIORITÉ ABSOLUE: TOUJOURS inclure les informations d'allergènes pour chaque pizza mentionnée
+- Si des allergènes sont détectés, AVERTIS CLAIREMENT le client avec des emojis ⚠️
+- Si le client mentionne des allergies spécifiques, VÉRIFIE LA COMPATIBILITÉ
+- Utilise le format: "⚠️ Allergènes: [liste]" ou "✅ Aucun allergène majeur détecté"
+- Suggère des alternatives sans allergènes si nécessaire
+- Sois précis et utile
+- Reste dans le rôle d'un assistant de pizzeria"""
+
+PROMPT_TEMPLATE = """{system_role}
+
+{context_text}
+
+QUESTION DU CLIENT: {user_question}
+
+{instructions}
+
+RÉPONSE:"""
+
+
+def _existing_paths(paths: List[str]) -> set:
+    """
+    Returns which of the given paths exist, reading each parent directory once with os.scandir
+    instead of stat-ing every path.
+
+    Args:
+        paths (List[str]): The file paths to check.
+
+    Returns:
+        set: The subset of paths that exist.
+    """
+    listings: Dict[str, set] = {}
+    existing = set()
+    for path in paths:
+        directory, name = os.path.split(os.path.abspath(path))
+        if directory not in listings:
+            try:
+                with os.scandir(directory) as entries:
+                    listings[directory] = {entry.name for entry in entries}
+            except OSError:
+                listings[directory] = set()
+        if name in listings[directory]:
+            existing.add(path)
+    return existing
+
+
+def _strip_page_prefix(context: str) -> str:
+    """Removes the "[Page N] " prefix get_context puts before each chunk (it never contains an allergen keyword)"""
+    if context.startswith(CONTEXT_PAGE_PREFIX):
+        return context.partition("] ")[2]
+    return context
+
+
+@lru_cache(maxsize=ALLERGEN_DETECTION_CACHE_SIZE)
+def _allergens_in_text(text: str) -> Tuple[str, ...]:
+    """
+    Detects the allergens in a text, in the configured allergen order.
+    Memoized because the same retrieved chunks come back for many questions.
+    """
+    found = config.allergen.detect(text)
+    return tuple(allergen for allergen in config.allergen.get_allergen_keywords() if allergen in found)
+
+
+@lru_cache(maxsize=8)
+def _company_mention_patterns(companies: Tuple[Tuple[str, str], ...]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Builds the phrases that explicitly name a company in a question, built once per set of documents.
+
+    Args:
+        companies (Tuple[Tuple[str, str], ...]): (document name, company name) of every configured document.
+
+    Returns:
+        Tuple[Tuple[str, str], ...]: (lowercase phrase, document name) pairs, in the order they are checked.
+    """
+    patterns = []
+    for document_name, company_name in companies:
+        # Get the clean company name (e.g., "Anchor Pizza", "Marco Fuso")
+        company_name = company_name.lower()
+        
+        # Look for patterns like "chez [company]", "[company] a-t-il", etc.
+        patterns.extend((pattern, document_name) for pattern in (
+            f"chez {company_name}",
+            f"à {company_name}",
+            f"{company_name} a-t-il",
+            f"{company_name} avez-vous",
+            f"{company_name} propose",
+            f"restaurant {company_name}",
+            f"pizzeria {company_name}"
+        ))
+        
+        # Also check for individual company name parts, but only if very specific:
+        # longer words followed by clear restaurant/company indicators
+        for part in company_name.split():
+            if len(part) > 4:
+                patterns.extend((pattern, document_name) for pattern in (
+                    f"{part} pizza",
+                    f"{part} restaurant",
+                    f"chez {part}",
+                    f"pizzeria {part}"
+                ))
+    return tuple(patterns)
+
+
+def _save_answer_cache_at_exit(path: Path):
+    """Saves the answer cache of the last LLMInterface created for a cache file (registered with atexit)"""
+    with _answer_cache_owners_lock:
+        owner = _answer_cache_owners.get(path)
+    if owner is not None:
+        owner.save_answer_cache()
+
 
 class LLMInterface:
     """
@@ -13,42 +216,166 @@ class LLMInterface:
     and system status reporting for the modular pizzeria RAG pipeline.
     """    
 
-    def __init__(self):
+    def __init__(self, vector_store: Optional[VectorStore] = None):
         """
-        Initializes the LLMInterface with logging, chat and embedding model configuration, and vector store.
-        Tests the Ollama connection and prepares the vector store for context retrieval and querying.
+        Initializes the LLMInterface with logging and chat and embedding model configuration.
+        Tests the Ollama connection in the background; the vector store is created on first use unless one is given.
+
+        Args:
+            vector_store (Optional[VectorStore], optional): An existing vector store to share. Defaults to None.
         """
         self.logger = logging.getLogger(__name__)
         self.chat_model = config.models.chat_model
         self.embedding_model = config.models.embedding_model
+        self.ollama_client = get_client()
+        
+        # Reference list of every allergen, the same in every prompt
+        all_allergens = ", ".join(config.allergen.allergens_list or [])
+        self._allergen_reference = f"\nLISTE COMPLÈTE DES ALLERGÈNES À SURVEILLER:\n{all_allergens}\n\n"
+        
+        # Opened on first use unless one is shared with us; the lock keeps concurrent questions from opening two
+        self._vector_store = vector_store
+        self._vector_store_lock = threading.Lock()
+        
+        # Last Ollama probe results as (time, chat ok, embeddings ok), shared by status calls
+        self._health: Optional[Tuple[float, bool, bool]] = None
+        self._health_lock = threading.Lock()
         
-        # Test Ollama connection
-        self._test_ollama_connection()
+        # Test Ollama connection without blocking construction (it also loads the chat model)
+        threading.Thread(target=self._test_ollama_connection, name="ollama-check", daemon=True).start()
         
-        # Initialize vector store with Ollama embeddings
-        self.vector_store = VectorStore()
+        # Answers to previous questions, reused for repeated and near-duplicate questions; when
+        # persist_answer_cache is enabled, also restored from the previous session and saved again on exit
+        self.answer_cache = AnswerCache()
+        self._answer_cache_path = Path(config.vector_store.db_path) / ANSWER_CACHE_FILE
+        self._answer_cache_stamp = self._index_stamp()
+        if config.vector_store.persist_answer_cache:
+            self._load_answer_cache()
+            with _answer_cache_owners_lock:
+                if self._answer_cache_path not in _answer_cache_owners:
+                    atexit.register(_save_answer_cache_at_exit, self._answer_cache_path)
+                _answer_cache_owners[self._answer_cache_path] = self
+        else:
+            # Questions saved while persistence was enabled are not kept around once it is turned off
+            self._remove_answer_cache_file()
+    
+    @property
+    def vector_store(self) -> VectorStore:
+        """The vector store with Ollama embeddings, opened on first access"""
+        if self._vector_store is None:
+            with self._vector_store_lock:
+                if self._vector_store is None:
+                    self._vector_store = VectorStore()
+        return self._vector_store
+    
+    def _index_stamp(self) -> str:
+        """
+        Fingerprints everything a cached answer depends on: the vector store's index manifest (which changes
+        whenever documents are re-indexed), the models, the generation options, the prompt wording and the
+        cache format. Returns an empty string when nothing is indexed yet.
+        """
+        try:
+            with open(Path(config.vector_store.db_path) / INDEX_MANIFEST_FILE, 'rb') as f:
+                manifest = f.read()
+        except OSError:
+            return ""
+        digest = hashlib.sha256(manifest)
+        for part in (ANSWER_CACHE_VERSION, self.chat_model, self.embedding_model,
+                     sorted(self._chat_options().items()), PROMPT_TEMPLATE,
+                     MULTI_COMPANY_ROLE, MULTI_COMPANY_INSTRUCTIONS,
+                     SINGLE_COMPANY_ROLE, SINGLE_COMPANY_INSTRUCTIONS):
+            digest.update(b"\0" + repr(part).encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _load_answer_cache(self):
+        """Restores the answers saved by a previous session, unless the indexed documents changed since"""
+        if not self._answer_cache_stamp or not self._answer_cache_path.exists():
+            return
+        try:
+            restored = self.answer_cache.load(self._answer_cache_path, self._answer_cache_stamp)
+            if restored:
+                self.logger.info("♻️ Restored %d cached answers", restored)
+        except Exception as e:
+            # A truncated or corrupt file only costs the saved answers: start empty and drop it
+            self.logger.warning("Could not load answer cache, discarding it: %s", e)
+            self.answer_cache.clear()
+            self._remove_answer_cache_file()
+    
+    def _remove_answer_cache_file(self):
+        """Deletes the saved answer cache, if any (a failure only leaves the file behind)"""
+        try:
+            self._answer_cache_path.unlink(missing_ok=True)
+        except OSError as e:
+            self.logger.warning("Could not remove answer cache file: %s", e)
+    
+    def refresh_answer_cache(self):
+        """Drops every cached answer if the indexed documents changed since they were cached (e.g. after reprocessing)"""
+        stamp = self._index_stamp()
+        if stamp != self._answer_cache_stamp:
+            self.answer_cache.clear()
+            self._answer_cache_stamp = stamp
+    
+    def save_answer_cache(self):
+        """Saves the answer cache for the next session (answers are tied to the index loaded at startup)"""
+        if not self._answer_cache_stamp:
+            return
+        try:
+            self.answer_cache.save(self._answer_cache_path, self._answer_cache_stamp)
+        except (OSError, TypeError, ValueError) as e:
+            self.logger.warning("Could not save answer cache: %s", e)
         
     def _test_ollama_connection(self):
         """
-        Tests the connection to the Ollama chat and embedding models to ensure they are available.
-        Logs the status of the chat and embedding models, and provides instructions if the connection fails.
+        Tests the connection to the Ollama chat model to ensure it is available.
+        The embedding model is checked by the vector store when it is created, so it is not loaded twice here.
+        Logs the status of the chat model, and provides instructions if the connection fails.
         """
         try:
             # Test chat model
-            ollama.chat(model=self.chat_model, messages=[{"role": "user", "content": "test"}])
-            self.logger.info(f"✅ Ollama chat model '{self.chat_model}' is ready")
-            
-            # Test embedding model
-            ollama.embeddings(model=self.embedding_model, prompt="test")
-            self.logger.info(f"✅ Ollama embedding model '{self.embedding_model}' is ready")
+            self._probe_chat()
+            self.logger.info("✅ Ollama chat model '%s' is ready", self.chat_model)
             
         except Exception as e:
-            self.logger.error(f"❌ Ollama connection failed: {e}")
+            self.logger.error("❌ Ollama connection failed: %s", e)
             self.logger.info("Make sure Ollama is running: ollama serve")
-            self.logger.info(f"And that models are available: ollama pull {self.chat_model} && ollama pull {self.embedding_model}")
+            self.logger.info("And that models are available: ollama pull %s && ollama pull %s",
+                             self.chat_model, self.embedding_model)
+    
+    def _probe_chat(self):
+        """Asks the chat model for a single token, raising if Ollama or the model is unavailable"""
+        self.ollama_client.chat(model=self.chat_model, messages=[{"role": "user", "content": "test"}],
+                                options=PROBE_OPTIONS)
+    
+    def _check_ollama(self) -> Tuple[bool, bool]:
+        """
+        Probes the chat and embedding models, reusing the last result for HEALTH_CHECK_TTL seconds.
+        Concurrent callers wait for a single probe instead of each sending their own.
+
+        Returns:
+            Tuple[bool, bool]: Whether the chat model and the embedding model answered.
+        """
+        with self._health_lock:
+            if self._health is not None and time.monotonic() - self._health[0] < HEALTH_CHECK_TTL:
+                return self._health[1], self._health[2]
+            
+            try:
+                self._probe_chat()
+                chat_ok = True
+            except Exception:
+                chat_ok = False
+            
+            try:
+                # Test embedding model (same endpoint as the vector store)
+                self.ollama_client.embed(model=self.embedding_model, input="test")
+                embeddings_ok = True
+            except Exception:
+                embeddings_ok = False
+            
+            self._health = (time.monotonic(), chat_ok, embeddings_ok)
+            return chat_ok, embeddings_ok
     
     def get_context(self, query: str, document_names: Optional[Union[str, List[str]]] = None, 
-                    max_chunks: int = 5) -> Dict:
+                    max_chunks: int = 5, query_embedding: Optional[List[float]] = None) -> Dict:
         """
         Retrieves relevant context from the vector store for a given query, grouped by company.
         Returns a dictionary containing context snippets, documents used, and company diversity information.
@@ -57,6 +384,7 @@ class LLMInterface:
             query (str): The user query to search for relevant context.
             document_names (Optional[Union[str, List[str]]]): Specific document names to search, or None for all.
             max_chunks (int): Maximum number of context chunks to retrieve.
+            query_embedding (Optional[List[float]]): The query's embedding if already computed, or None.
 
         Returns:
             Dict: A dictionary with context grouped by company, documents used, and a flag for multiple companies.
@@ -64,17 +392,16 @@ class LLMInterface:
         # If no specific documents requested, search more results to ensure diversity
         search_limit = max_chunks * 2 if document_names is None else max_chunks
         
-        search_results = self.vector_store.search(query, document_names=document_names, n_results=search_limit)
+        search_results = self.vector_store.search(query, document_names=document_names, n_results=search_limit,
+                                                  query_embedding=query_embedding)
         
         # Group context by document/company with diversity control
         context_by_company = {}
         documents_used = []
-        company_counts = {}
+        total_results = 0
         max_per_company = max(2, max_chunks // 2) if document_names is None else max_chunks
         
         for result in search_results.get('results', []):
-            content = result.get('content', '')
-            metadata = result.get('metadata', {})
             doc_name = result.get('document_name', 'unknown')
             
             if doc_name not in documents_used:
@@ -84,21 +411,15 @@ class LLMInterface:
             company_name = config.get_company_name(doc_name)
             
             # Limit results per company to ensure diversity
-            if company_name not in company_counts:
-                company_counts[company_name] = 0
-            
-            if company_counts[company_name] >= max_per_company:
+            if len(context_by_company.get(company_name, ())) >= max_per_company:
                 continue
-                
-            if company_name not in context_by_company:
-                context_by_company[company_name] = []
             
-            context_part = f"[Page {metadata.get('page', 'N/A')}] {content}"
-            context_by_company[company_name].append(context_part)
-            company_counts[company_name] += 1
+            metadata = result.get('metadata', {})
+            context_by_company.setdefault(company_name, []).append(
+                f"[Page {metadata.get('page', 'N/A')}] {result.get('content', '')}")
+            total_results += 1
             
             # Stop if we have enough total results
-            total_results = sum(len(contexts) for contexts in context_by_company.values())
             if total_results >= max_chunks:
                 break
         
@@ -122,44 +443,15 @@ class LLMInterface:
         query_lower = query.lower()
         
         # Only detect companies if they are explicitly mentioned with clear indicators
-        for doc in config.documents:
-            # Get the clean company name (e.g., "Anchor Pizza", "Marco Fuso")
-            company_name = config.get_company_name(doc.name).lower()
-            
-            # Check for explicit company mentions with context
-            # Look for patterns like "chez [company]", "[company] a-t-il", etc.
-            explicit_patterns = [
-                f"chez {company_name}",
-                f"à {company_name}",
-                f"{company_name} a-t-il",
-                f"{company_name} avez-vous",
-                f"{company_name} propose",
-                f"restaurant {company_name}",
-                f"pizzeria {company_name}"
-            ]
-            
-            for pattern in explicit_patterns:
-                if pattern in query_lower:
-                    return doc.name
-            
-            # Also check for individual company name parts, but only if very specific
-            company_parts = company_name.split()
-            for part in company_parts:
-                if len(part) > 4:  # Only check longer words to avoid false positives
-                    # Must be followed by clear restaurant/company indicators
-                    company_indicators = [
-                        f"{part} pizza",
-                        f"{part} restaurant", 
-                        f"chez {part}",
-                        f"pizzeria {part}"
-                    ]
-                    for indicator in company_indicators:
-                        if indicator in query_lower:
-                            return doc.name
+        companies = tuple((doc.name, config.get_company_name(doc.name)) for doc in config.documents)
+        for pattern, document_name in _company_mention_patterns(companies):
+            if pattern in query_lower:
+                return document_name
         
         return None
     
-    def create_prompt(self, user_question: str, context_data: Dict, document_names: Optional[Union[str, List[str]]] = None) -> str:
+    def create_prompt(self, user_question: str, context_data: Dict, document_names: Optional[Union[str, List[str]]] = None,
+                      allergen_info: Optional[Dict[str, List[str]]] = None) -> str:
         """
         Creates a prompt for the language model using the user's question and relevant context.
         Formats the context, allergen information, and instructions based on the number of companies involved.
@@ -168,6 +460,7 @@ class LLMInterface:
             user_question (str): The user's question to be answered.
             context_data (Dict): Contextual information grouped by company.
             document_names (Optional[Union[str, List[str]]]): Specific document names to focus on, or None.
+            allergen_info (Optional[Dict[str, List[str]]]): Allergens per company if already computed, or None.
 
         Returns:
             str: The formatted prompt to be sent to the language model.
@@ -177,87 +470,58 @@ class LLMInterface:
         has_multiple_companies = context_data['has_multiple_companies']
 
         # Get allergen information for all contexts
-        allergen_info = self.get_allergen_info_for_context(context_data)
+        if allergen_info is None:
+            allergen_info = self.get_allergen_info_for_context(context_data)
 
+        # Context pieces are collected in a list and joined once
+        parts = []
+        
         # Format context based on whether we have multiple companies
         if has_multiple_companies:
             # Multi-company format
-            context_text = "INFORMATIONS DE NOS DIFFÉRENTS SERVICES:\n\n"
+            parts.append("INFORMATIONS DE NOS DIFFÉRENTS SERVICES:\n\n")
             for company_name, company_contexts in context_by_company.items():
-                context_text += f"🍕 {company_name.upper()}:\n"
+                parts.append(f"🍕 {company_name.upper()}:\n")
                 for ctx in company_contexts:
-                    context_text += f"   {ctx}\n"
+                    parts.append(f"   {ctx}\n")
 
                 # Add allergen information for this company
-                if company_name in allergen_info and allergen_info[company_name]:
-                    allergens = ", ".join(allergen_info[company_name])
-                    context_text += f"   ⚠️ ALLERGÈNES DÉTECTÉS: {allergens}\n"
+                if allergen_info.get(company_name):
+                    parts.append(f"   ⚠️ ALLERGÈNES DÉTECTÉS: {', '.join(allergen_info[company_name])}\n\n")
                 else:
-                    context_text += f"   ✅ AUCUN ALLERGÈNE MAJEUR DÉTECTÉ\n"
-                context_text += "\n"
+                    parts.append("   ✅ AUCUN ALLERGÈNE MAJEUR DÉTECTÉ\n\n")
         else:
             # Single company format (like the original working version)
-            company_name = list(context_by_company.keys())[0] if context_by_company else "Restaurant"
-            context_text = f"INFORMATIONS DE {company_name.upper()}:\n\n"
+            company_name = next(iter(context_by_company), "Restaurant")
+            parts.append(f"INFORMATIONS DE {company_name.upper()}:\n\n")
             for company_contexts in context_by_company.values():
                 for ctx in company_contexts:
-                    context_text += f"{ctx}\n\n"
+                    parts.append(f"{ctx}\n\n")
 
             # Add allergen information for single company
-            if company_name in allergen_info and allergen_info[company_name]:
-                allergens = ", ".join(allergen_info[company_name])
-                context_text += f"⚠️ ALLERGÈNES DÉTECTÉS: {allergens}\n\n"
+            if allergen_info.get(company_name):
+                parts.append(f"⚠️ ALLERGÈNES DÉTECTÉS: {', '.join(allergen_info[company_name])}\n\n")
             else:
-                context_text += f"✅ AUCUN ALLERGÈNE MAJEUR DÉTECTÉ\n\n"
+                parts.append("✅ AUCUN ALLERGÈNE MAJEUR DÉTECTÉ\n\n")
 
         # Add comprehensive allergen list for reference
-        allergen_list = config.allergen.allergens_list or []
-        all_allergens = ", ".join(allergen_list)
-        context_text += f"\nLISTE COMPLÈTE DES ALLERGÈNES À SURVEILLER:\n{all_allergens}\n\n"
+        parts.append(self._allergen_reference)
 
         if user_allergens := self.extract_user_allergens_from_question(
             user_question
         ):
-            context_text += f"⚠️ ATTENTION: Le client a mentionné être allergique à: {', '.join(user_allergens)}\n\n"
+            parts.append(f"⚠️ ATTENTION: Le client a mentionné être allergique à: {', '.join(user_allergens)}\n\n")
+
+        context_text = "".join(parts)
 
         # Determine response strategy
         if has_multiple_companies:
-            system_role = "Tu es un assistant du groupe de pizzerias. Nous avons plusieurs restaurants avec des menus différents."
-            instructions = """INSTRUCTIONS:
-- Nous sommes un groupe de pizzerias avec plusieurs restaurants
-- Si la question est générale, présente les options de chaque restaurant séparément
-- Si un restaurant spécifique est mentionné, concentre-toi sur celui-ci
-- Sois précis sur quel restaurant offre quoi
-- Format: "Chez [Nom Restaurant]: [info]" pour chaque restaurant
-- PRIORITÉ ABSOLUE: TOUJOURS inclure les informations d'allergènes pour chaque pizza mentionnée
-- Si des allergènes sont détectés, AVERTIS CLAIREMENT le client avec des emojis ⚠️
-- Si le client mentionne des allergies spécifiques, VÉRIFIE LA COMPATIBILITÉ
-- Suggère des alternatives sans allergènes si nécessaire
-- Utilise le format: "⚠️ Allergènes: [liste]" ou "✅ Aucun allergène majeur détecté"
-- Reste dans le rôle d'un assistant de groupe de pizzerias"""
+            system_role, instructions = MULTI_COMPANY_ROLE, MULTI_COMPANY_INSTRUCTIONS
         else:
-            system_role = "Tu es un assistant de pizzeria. Réponds en français, sois précis et utile."
-            instructions = """INSTRUCTIONS:
-- Réponds uniquement en français
-- Base-toi uniquement sur les informations du contexte fourni
-- Si l'information n'est pas dans le contexte, dis-le clairement
-- PRIORITÉ ABSOLUE: TOUJOURS inclure les informations d'allergènes pour chaque pizza mentionnée
-- Si des allergènes sont détectés, AVERTIS CLAIREMENT le client avec des emojis ⚠️
-- Si le client mentionne des allergies spécifiques, VÉRIFIE LA COMPATIBILITÉ
-- Utilise le format: "⚠️ Allergènes: [liste]" ou "✅ Aucun allergène majeur détecté"
-- Suggère des alternatives sans allergènes si nécessaire
-- Sois précis et utile
-- Reste dans le rôle d'un assistant de pizzeria"""
-
-        prompt = f"""{system_role}
-
-{context_text}
-
-QUESTION DU CLIENT: {user_question}
+            system_role, instructions = SINGLE_COMPANY_ROLE, SINGLE_COMPANY_INSTRUCTIONS
 
-{instructions}
-
-RÉPONSE:"""
+        prompt = PROMPT_TEMPLATE.format(system_role=system_role, context_text=context_text,
+                                        user_question=user_question, instructions=instructions)
 
         return prompt
     
@@ -273,31 +537,72 @@ RÉPONSE:"""
             str: The response generated by the language model or a fallback message.
         """
         try:
-            response = ollama.chat(
+            response = self.ollama_client.chat(
                 model=self.chat_model,
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": "Tu es un assistant de pizzeria. Réponds en français, sois précis et utile."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                options={
-                    "temperature": config.models.temperature,
-                    "top_p": config.models.top_p,
-                    "num_predict": config.models.num_predict
-                }
+                messages=self._chat_messages(prompt),
+                options=self._chat_options()
             )
             
             return response['message']['content'].strip()
             
         except Exception as e:
-            self.logger.error(f"Error querying Ollama: {e}")
+            self.logger.error("Error querying Ollama: %s", e)
             return self._fallback_response(prompt)
     
+    def stream_llm(self, prompt: str) -> Iterator[str]:
+        """
+        Sends a prompt to the language model and yields the response as it is generated.
+        If the LLM is unavailable before any token arrives, yields the fallback response instead;
+        if it fails after tokens were yielded, the error is raised so the caller can discard the partial answer.
+
+        Args:
+            prompt (str): The formatted prompt to send to the language model.
+
+        Yields:
+            str: Successive pieces of the generated response.
+        """
+        started = False
+        try:
+            for part in self.ollama_client.chat(
+                model=self.chat_model,
+                messages=self._chat_messages(prompt),
+                options=self._chat_options(),
+                stream=True
+            ):
+                token = part['message']['content']
+                if not started:
+                    token = token.lstrip()
+                    if not token:
+                        continue
+                    started = True
+                yield token
+        except Exception as e:
+            self.logger.error("Error streaming from Ollama: %s", e)
+            if started:
+                raise
+            yield self._fallback_response(prompt)
+    
+    def _chat_messages(self, prompt: str) -> List[Dict[str, str]]:
+        """Builds the chat messages sent to Ollama for a prompt"""
+        return [
+            {
+                "role": "system", 
+                "content": "Tu es un assistant de pizzeria. Réponds en français, sois précis et utile."
+            },
+            {
+                "role": "user", 
+                "content": prompt
+            }
+        ]
+    
+    def _chat_options(self) -> Dict[str, Any]:
+        """Builds the generation options sent to Ollama from the model configuration"""
+        return {
+            "temperature": config.models.temperature,
+            "top_p": config.models.top_p,
+            "num_predict": config.models.num_predict
+        }
+    
     def _fallback_response(self, prompt: str) -> str:
         """
         Generates a fallback response when the language model is unavailable.
@@ -310,13 +615,12 @@ RÉPONSE:"""
             str: A fallback response with context and recovery instructions.
         """
         # Extract question from prompt
-        question = "votre question"
-        if "QUESTION DU CLIENT:" in prompt:
-            question = prompt.split('QUESTION DU CLIENT: ')[1].split('INSTRUCTIONS:')[0].strip()
+        match = PROMPT_QUESTION_RE.search(prompt)
+        question = match.group(1).strip() if match else "votre question"
         
         context_data = self.get_context(question, max_chunks=2)
         
-        return f"""🍕 Assistant Pizzeria (Mode Hors Ligne)
+        return f"""{OFFLINE_HEADER}
 
 Désolé, je ne peux pas accéder au modèle de langage actuellement.
 
@@ -328,7 +632,8 @@ Pour activer la fonctionnalité complète:
 1. Lancez Ollama: ollama serve
 2. Vérifiez que les modèles sont disponibles: ollama list"""
     
-    def answer_question(self, question: str, document_names: Optional[Union[str, List[str]]] = None, user_allergens: Optional[List[str]] = None) -> Dict:
+    def answer_question(self, question: str, document_names: Optional[Union[str, List[str]]] = None, user_allergens: Optional[List[str]] = None,
+                        query_embedding: Optional[List[float]] = None) -> Dict:
         """
         Answers a user question by retrieving relevant context, analyzing allergens, and querying the language model.
         Returns a dictionary with the answer, context used, allergen information, and additional metadata.
@@ -337,67 +642,42 @@ Pour activer la fonctionnalité complète:
             question (str): The user's question to answer.
             document_names (Optional[Union[str, List[str]]]): Specific document names to search, or None for all.
             user_allergens (Optional[List[str]]): List of user allergens to consider, or None to auto-detect.
+            query_embedding (Optional[List[float]]): The question's embedding if already computed, or None.
 
         Returns:
             Dict: A dictionary containing the answer, context, allergen info, and status.
         """
         try:
-            # Auto-detect user allergens from the question if not provided
-            if user_allergens is None:
-                user_allergens = self.extract_user_allergens_from_question(question)
+            document_names, user_allergens = self._resolve_question_scope(question, document_names, user_allergens)
 
-            # Auto-detect company if not specified and question contains company name
-            if document_names is None:
-                if detected_company := self._detect_company_in_query(question):
-                    document_names = detected_company
+            # Step 0: Reuse the answer to the same or a near-identical earlier question
+            scope, query_embedding, cached, context_data = self._lookup_cached_answer(
+                question, document_names, user_allergens, query_embedding)
+            if cached is not None:
+                return dict(cached, question=question)
 
-            # Step 1: Get relevant context with company grouping
-            context_data = self.get_context(question, document_names=document_names)
+            # Step 1: Get relevant context with company grouping (unless a related question's can be reused)
+            if context_data is None:
+                context_data = self.get_context(question, document_names=document_names, query_embedding=query_embedding)
 
             # Step 2: Get allergen information
             allergen_info = self.get_allergen_info_for_context(context_data)
 
             # Step 3: Create prompt with allergen awareness
-            prompt = self.create_prompt(question, context_data, document_names=document_names)
+            prompt = self.create_prompt(question, context_data, document_names=document_names, allergen_info=allergen_info)
 
             # Step 4: Query LLM
             answer = self.query_llm(prompt)
 
             # Step 5: Add allergen analysis to the response
-            allergen_analysis = ""
-            if user_allergens:
-                allergen_analysis = self.suggest_alternatives_for_allergens(user_allergens, context_data)
-                self.logger.info(f"🚨 User allergens detected: {', '.join(user_allergens)}")
-
-            # Always add detected allergens summary for transparency
-            if allergen_info:
-                allergen_summary = "\n\n🧾 **Résumé allergènes détectés:**\n"
-                for company_name, allergens in allergen_info.items():
-                    if allergens:
-                        allergen_summary += f"• {company_name}: {', '.join(allergens)}\n"
-                    else:
-                        allergen_summary += f"• {company_name}: Aucun allergène majeur détecté\n"
-                answer += allergen_summary
-
-            # Add user-specific allergen analysis if provided
-            if allergen_analysis:
-                answer += allergen_analysis
+            answer += self._allergen_summary(context_data, allergen_info, user_allergens)
 
-            return {
-                "status": "success",
-                "question": question,
-                "answer": answer,
-                "context_used": context_data['context_by_company'],
-                "has_context": bool(context_data['context_by_company']),
-                "searched_documents": document_names or [doc.name for doc in config.documents],
-                "has_multiple_companies": context_data['has_multiple_companies'],
-                "companies_found": list(context_data['context_by_company'].keys()),
-                "allergen_info": allergen_info,
-                "user_allergens": user_allergens or []
-            }
+            result = self._build_result(question, answer, context_data, document_names, allergen_info, user_allergens)
+            self._cache_answer(scope, question, query_embedding, result)
+            return result
 
         except Exception as e:
-            self.logger.error(f"Error in RAG pipeline: {e}")
+            self.logger.error("Error in RAG pipeline: %s", e)
             return {
                 "status": "error",
                 "question": question,
@@ -411,6 +691,214 @@ Pour activer la fonctionnalité complète:
                 "user_allergens": user_allergens or []
             }
     
+    def answer_questions(self, questions: Sequence[str], document_names: Optional[Union[str, List[str]]] = None,
+                         user_allergens: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Answers several independent questions: their embeddings are generated in one batched
+        embedding request, then the questions are asked concurrently (up to MAX_PARALLEL_QUESTIONS at a time)
+        since each is dominated by Ollama latency.
+
+        Args:
+            questions (Sequence[str]): The questions to answer.
+            document_names (Optional[Union[str, List[str]]]): Specific document names to search, or None for all.
+            user_allergens (Optional[List[str]]): List of user allergens to consider, or None to auto-detect.
+
+        Returns:
+            List[Dict]: One answer_question result per question, in the same order.
+        """
+        if not questions:
+            return []
+        query_embeddings = self.vector_store.embed_queries(list(questions))
+        max_workers = min(len(questions), MAX_PARALLEL_QUESTIONS)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="question") as executor:
+            return list(executor.map(
+                lambda question, query_embedding: self.answer_question(
+                    question, document_names=document_names, user_allergens=user_allergens,
+                    query_embedding=query_embedding),
+                questions, query_embeddings
+            ))
+    
+    def stream_answer(self, question: str, document_names: Optional[Union[str, List[str]]] = None, user_allergens: Optional[List[str]] = None,
+                      outcome: Optional[Dict[str, str]] = None) -> Iterator[str]:
+        """
+        Streaming variant of answer_question: yields the answer piece by piece as the language model generates it.
+        The allergen summary and analysis are yielded last, once generation has finished.
+        If generation is cut off, an error notice is yielded instead and the partial answer is not cached.
+
+        Args:
+            question (str): The user's question to answer.
+            document_names (Optional[Union[str, List[str]]]): Specific document names to search, or None for all.
+            user_allergens (Optional[List[str]]): List of user allergens to consider, or None to auto-detect.
+            outcome (Optional[Dict[str, str]], optional): Filled with the answer's "status" ("success" or "error",
+                the latter also when only the offline fallback could be given) once the stream ends. Defaults to None.
+
+        Yields:
+            str: Successive pieces of the answer.
+        """
+        if outcome is None:
+            outcome = {}
+        outcome["status"] = "error"
+        try:
+            document_names, user_allergens = self._resolve_question_scope(question, document_names, user_allergens)
+
+            scope, query_embedding, cached, context_data = self._lookup_cached_answer(question, document_names,
+                                                                                      user_allergens)
+            if cached is not None:
+                outcome["status"] = "success"
+                yield cached['answer']
+                return
+
+            if context_data is None:
+                context_data = self.get_context(question, document_names=document_names, query_embedding=query_embedding)
+            allergen_info = self.get_allergen_info_for_context(context_data)
+            prompt = self.create_prompt(question, context_data, document_names=document_names, allergen_info=allergen_info)
+
+            if context_data['context_by_company']:
+                self.logger.info("📄 Streaming response - Sources: %s", ", ".join(context_data['context_by_company']))
+            else:
+                self.logger.info("⚠️ No specific context found in documents")
+
+            pieces = []
+            try:
+                for token in self.stream_llm(prompt):
+                    pieces.append(token)
+                    yield token
+            except Exception as e:
+                # Generation stopped midway: the partial answer is neither completed nor cached
+                yield f"\n\n⚠️ Réponse interrompue, veuillez réessayer. ({e})"
+                return
+            summary = self._allergen_summary(context_data, allergen_info, user_allergens)
+            yield summary
+
+            answer = "".join(pieces).rstrip() + summary
+            if not answer.startswith(OFFLINE_HEADER):
+                outcome["status"] = "success"
+            self._cache_answer(scope, question, query_embedding,
+                               self._build_result(question, answer, context_data, document_names, allergen_info, user_allergens))
+
+        except Exception as e:
+            self.logger.error("Error in RAG pipeline: %s", e)
+            yield f"Désolé, une erreur s'est produite: {str(e)}"
+    
+    def _resolve_question_scope(self, question: str, document_names: Optional[Union[str, List[str]]],
+                                user_allergens: Optional[List[str]]) -> Tuple[Optional[Union[str, List[str]]], List[str]]:
+        """
+        Fills in what the caller left unspecified: the user's allergens and a company explicitly named in the question.
+
+        Args:
+            question (str): The user's question.
+            document_names (Optional[Union[str, List[str]]]): Documents to search, or None to auto-detect.
+            user_allergens (Optional[List[str]]): The user's allergens, or None to auto-detect.
+
+        Returns:
+            Tuple: The document names (None for all documents) and the user's allergens.
+        """
+        # Auto-detect user allergens from the question if not provided
+        if user_allergens is None:
+            user_allergens = self.extract_user_allergens_from_question(question)
+
+        # Auto-detect company if not specified and question contains company name
+        if document_names is None:
+            if detected_company := self._detect_company_in_query(question):
+                document_names = detected_company
+
+        return document_names, user_allergens
+    
+    def _lookup_cached_answer(self, question: str, document_names: Optional[Union[str, List[str]]],
+                              user_allergens: List[str],
+                              query_embedding: Optional[List[float]] = None
+                              ) -> Tuple[Tuple, Optional[List[float]], Optional[Dict], Optional[Dict]]:
+        """
+        Checks the answer cache, first for the exact question and then for a semantically similar one.
+        A related but less similar question does not share its answer, only its retrieved context.
+        The question embedding computed for the semantic lookup is returned so the search can reuse it.
+
+        Args:
+            question (str): The user's question.
+            document_names (Optional[Union[str, List[str]]]): The documents the answer is scoped to.
+            user_allergens (List[str]): The user's allergens the answer is scoped to.
+            query_embedding (Optional[List[float]], optional): The question's embedding if already computed. Defaults to None.
+
+        Returns:
+            Tuple: The cache scope, the question embedding (None on an exact hit), the cached result or None,
+                and the context data to reuse instead of searching, or None.
+        """
+        scope = self.answer_cache.scope(document_names, user_allergens)
+        cached = self.answer_cache.get_exact(scope, question)
+        if cached is not None:
+            self.logger.info("⚡ Answer served from cache (exact match)")
+            return scope, None, cached, None
+
+        if query_embedding is None:
+            query_embedding = self.vector_store.embed_query(question)
+        related, reuse_answer = self.answer_cache.get_similar(scope, query_embedding)
+        if related is None:
+            return scope, query_embedding, None, None
+        if reuse_answer:
+            self.logger.info("⚡ Answer served from cache (similar question)")
+            return scope, query_embedding, related, None
+
+        self.logger.info("⚡ Reusing the context of a related question")
+        context_data = {
+            'context_by_company': related['context_used'],
+            'documents_used': [],
+            'has_multiple_companies': related['has_multiple_companies']
+        }
+        return scope, query_embedding, None, context_data
+    
+    def _cache_answer(self, scope: Tuple, question: str, query_embedding: Optional[List[float]], result: Dict):
+        """Stores a result in the answer cache, unless it was produced while Ollama was unavailable"""
+        if result['answer'].startswith(OFFLINE_HEADER) or not any(query_embedding or ()):
+            return
+        self.answer_cache.put(scope, question, query_embedding, result)
+    
+    def _build_result(self, question: str, answer: str, context_data: Dict,
+                      document_names: Optional[Union[str, List[str]]], allergen_info: Dict[str, List[str]],
+                      user_allergens: List[str]) -> Dict:
+        """Assembles the successful result dictionary returned by answer_question"""
+        return {
+            "status": "success",
+            "question": question,
+            "answer": answer,
+            "context_used": context_data['context_by_company'],
+            "has_context": bool(context_data['context_by_company']),
+            "searched_documents": document_names or [doc.name for doc in config.documents],
+            "has_multiple_companies": context_data['has_multiple_companies'],
+            "companies_found": list(context_data['context_by_company'].keys()),
+            "allergen_info": allergen_info,
+            "user_allergens": user_allergens or []
+        }
+    
+    def _allergen_summary(self, context_data: Dict, allergen_info: Dict[str, List[str]], user_allergens: Optional[List[str]]) -> str:
+        """
+        Builds the allergen text appended to an answer: detected allergens per company, then the user-specific analysis.
+
+        Args:
+            context_data (Dict): The context data used to answer the question.
+            allergen_info (Dict[str, List[str]]): Allergens detected per company.
+            user_allergens (Optional[List[str]]): The user's allergens, if any.
+
+        Returns:
+            str: The text to append to the answer (empty if there is nothing to report).
+        """
+        allergen_analysis = ""
+        if user_allergens:
+            allergen_analysis = self.suggest_alternatives_for_allergens(user_allergens, context_data, allergen_info)
+            self.logger.info("🚨 User allergens detected: %s", ", ".join(user_allergens))
+
+        # Always add detected allergens summary for transparency
+        summary = ""
+        if allergen_info:
+            summary = "\n\n🧾 **Résumé allergènes détectés:**\n"
+            for company_name, allergens in allergen_info.items():
+                if allergens:
+                    summary += f"• {company_name}: {', '.join(allergens)}\n"
+                else:
+                    summary += f"• {company_name}: Aucun allergène majeur détecté\n"
+
+        # Add user-specific allergen analysis if provided
+        return summary + allergen_analysis
+    
     def extract_user_allergens_from_question(self, question: str) -> List[str]:
         """
         Extracts user allergens mentioned in the question by analyzing keywords and context indicators.
@@ -423,62 +911,21 @@ Pour activer la fonctionnalité complète:
             List[str]: A list of allergens detected in the question.
         """  
         question_lower = question.lower()
-        user_allergens = []
 
-        # Check for allergen mentions in the question
-        allergen_keywords = config.allergen.get_allergen_keywords()
+        # Only look for allergens when the question talks about allergies or restrictions
+        if not any(indicator in question_lower for indicator in ALLERGEN_CONTEXT_INDICATORS):
+            return []
 
-        # First, look for general allergen context indicators
-        allergen_context_indicators = [
-            "allergique", "allergie", "allergies", "allergène", "allergènes",
-            "intolerance", "intolérant", "sans", "éviter", "peut pas manger",
-            "ne peux pas manger", "ne mange pas"
-        ]
+        # A strong indicator anywhere in the question is enough; otherwise the keyword
+        # must directly follow a restriction ("pas de", "ne mange pas", ...)
+        strong_context = any(context in question_lower for context in STRONG_ALLERGEN_CONTEXT)
 
-        has_allergen_context = any(indicator in question_lower for indicator in allergen_context_indicators)
-
-        # If there's allergen context, be more liberal in detecting allergens
-        if has_allergen_context:
-            for allergen, keywords in allergen_keywords.items():
-                for keyword in keywords:
-                    if keyword in question_lower:
-                        # Check for negative context (allergic to, can't eat, etc.)
-                        allergen_patterns = [
-                            f"allergique au {keyword}",
-                            f"allergique à {keyword}",
-                            f"allergique aux {keyword}",
-                            f"allergie au {keyword}",
-                            f"allergie à {keyword}",
-                            f"allergie aux {keyword}",
-                            f"pas de {keyword}",
-                            f"sans {keyword}",
-                            f"éviter {keyword}",
-                            f"ne peut pas manger {keyword}",
-                            f"ne peux pas manger {keyword}",
-                            f"ne mange pas {keyword}",
-                            f"intolérant au {keyword}",
-                            f"intolérant à {keyword}",
-                            f"intolerance au {keyword}",
-                            f"intolerance à {keyword}",
-                            f"éviter les {keyword}",
-                            f"allergie aux {keyword}",
-                            f"peut pas manger de {keyword}",
-                            f"ne peux pas manger de {keyword}"
-                        ]
-
-                        # Check specific patterns first
-                        pattern_found = False
-                        for pattern in allergen_patterns:
-                            if pattern in question_lower:
-                                if allergen not in user_allergens:
-                                    user_allergens.append(allergen)
-                                pattern_found = True
-                                break
-
-                        # If no specific pattern found but allergen context exists
-                        # and keyword is mentioned, consider it an allergen
-                        if not pattern_found and any(context in question_lower for context in ["allergique", "allergie", "sans", "éviter"]) and allergen not in user_allergens:
-                            user_allergens.append(allergen)
+        user_allergens = []
+        for keyword, allergen in ALLERGEN_KEYWORD_PAIRS:
+            if keyword in question_lower and allergen not in user_allergens and (
+                strong_context or any(prefix + keyword in question_lower for prefix in RESTRICTION_PREFIXES)
+            ):
+                user_allergens.append(allergen)
 
         return user_allergens
     
@@ -493,14 +940,8 @@ Pour activer la fonctionnalité complète:
         Returns:
             bool: True if the question is allergen-related, False otherwise.
         """
-        allergen_indicators = [
-            "allergique", "allergie", "allergies", "allergène", "allergènes",
-            "intolerance", "intolérant", "sans", "éviter", "peut pas manger",
-            "gluten", "lactose", "végétalien", "vegan", "végétarien"
-        ]
-        
         question_lower = question.lower()
-        return any(indicator in question_lower for indicator in allergen_indicators)
+        return any(indicator in question_lower for indicator in ALLERGEN_QUESTION_INDICATORS)
 
     def get_available_documents(self) -> Dict[str, str]:
         """Get available documents for selection"""
@@ -515,19 +956,11 @@ Pour activer la fonctionnalité complète:
             "documents": {}
         }
 
-        try:
-            # Test chat model
-            ollama.chat(model=self.chat_model, messages=[{"role": "user", "content": "test"}])
-            status["ollama_chat"] = True
-        except Exception:
-            status["ollama_chat"] = False
+        # Probe both models (cached for HEALTH_CHECK_TTL so frequent status polls stay cheap)
+        status["ollama_chat"], status["ollama_embeddings"] = self._check_ollama()
 
-        try:
-            # Test embedding model
-            ollama.embeddings(model=self.embedding_model, prompt="test")
-            status["ollama_embeddings"] = True
-        except Exception:
-            status["ollama_embeddings"] = False
+        # Answer cache effectiveness since startup
+        status["answer_cache"] = self.answer_cache.stats()
 
         # Vector store stats
         try:
@@ -536,11 +969,12 @@ Pour activer la fonctionnalité complète:
             status["vector_store"] = {"error": str(e)}
 
         # Document status
+        existing = _existing_paths([path for doc_config in config.documents
+                                    for path in (doc_config.pdf_path, doc_config.processed_json_path)])
         for doc_config in config.documents:
-            from pathlib import Path
             status["documents"][doc_config.name] = {
-                "pdf_exists": Path(doc_config.pdf_path).exists(),
-                "json_exists": Path(doc_config.processed_json_path).exists(),
+                "pdf_exists": doc_config.pdf_path in existing,
+                "json_exists": doc_config.processed_json_path in existing,
                 "description": doc_config.description
             }
 
@@ -559,42 +993,27 @@ Pour activer la fonctionnalité complète:
         """
         if not text:
             return []
-        
-        text_lower = text.lower()
-        detected_allergens = []
-        allergen_keywords = config.allergen.get_allergen_keywords()
-        
-        for allergen, keywords in allergen_keywords.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    if allergen not in detected_allergens:
-                        detected_allergens.append(allergen)
-                    break  # Found this allergen, no need to check other keywords
-        
-        return detected_allergens
+        return list(_allergens_in_text(text))
     
     def get_allergen_info_for_context(self, context_data: Dict) -> Dict[str, List[str]]:
         """Extract allergen information from context data"""
-        allergen_info = {}
-        
-        for company_name, company_contexts in context_data['context_by_company'].items():
-            company_allergens = set()
-            
-            for context in company_contexts:
-                # Detect allergens in each context piece
-                detected = self.detect_allergens_in_text(context)
-                company_allergens.update(detected)
-            
-            allergen_info[company_name] = sorted(list(company_allergens))
-        
-        return allergen_info
+        # Each context piece is scanned once (memoized per chunk text, without its page prefix so the
+        # same text on another page or from another company is a cache hit), then a company's
+        # allergens are merged in a single set union
+        return {
+            company_name: sorted(set().union(*(_allergens_in_text(_strip_page_prefix(context))
+                                               for context in company_contexts if context)))
+            for company_name, company_contexts in context_data['context_by_company'].items()
+        }
     
-    def suggest_alternatives_for_allergens(self, user_allergens: List[str], context_data: Dict) -> str:
-        """Suggest pizza alternatives based on user's allergen restrictions"""
+    def suggest_alternatives_for_allergens(self, user_allergens: List[str], context_data: Dict,
+                                           allergen_info: Optional[Dict[str, List[str]]] = None) -> str:
+        """Suggest pizza alternatives based on user's allergen restrictions (allergen_info is recomputed if not given)"""
         if not user_allergens:
             return ""
         
-        allergen_info = self.get_allergen_info_for_context(context_data)
+        if allergen_info is None:
+            allergen_info = self.get_allergen_info_for_context(context_data)
         suggestions = []
         
         for company_name, company_allergens in allergen_info.items():
@@ -624,19 +1043,29 @@ if __name__ == "__main__":
         "Avez-vous des pizzas végétariennes?"
     ]
     
+    # Load both models before timing: opening the vector store tests the embedding model,
+    # and the status probe loads the chat model
+    llm.vector_store
+    llm.get_system_status()
+    
+    # Each batch of questions is embedded in one request and asked concurrently
     print("🔸 Testing with ALL documents:")
-    for question in test_questions:
+    start = time.perf_counter()
+    results = llm.answer_questions(test_questions)
+    print(f"⏱️ {len(test_questions)} questions in {time.perf_counter() - start:.2f}s")
+    for question, result in zip(test_questions, results):
         print(f"\n🔸 Question: {question}")
-        result = llm.answer_question(question)
         print(f"✅ Réponse: {result['answer']}")
         print(f"📄 Contexte utilisé: {'Oui' if result['has_context'] else 'Non'}")
         print(f"📚 Documents consultés: {result['searched_documents']}")
     
     print("\n" + "="*50)
     print("🔸 Testing with SPECIFIC document (marco_fuso):")
-    for question in test_questions:
+    start = time.perf_counter()
+    results = llm.answer_questions(test_questions, document_names="marco_fuso")
+    print(f"⏱️ {len(test_questions)} questions in {time.perf_counter() - start:.2f}s")
+    for question, result in zip(test_questions, results):
         print(f"\n🔸 Question: {question}")
-        result = llm.answer_question(question, document_names="marco_fuso")
         print(f"✅ Réponse: {result['answer']}")
         print(f"📄 Contexte utilisé: {'Oui' if result['has_context'] else 'Non'}")
         print(f"📚 Documents consultés: {result['searched_documents']}")
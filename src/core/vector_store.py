@@ -1,10 +1,38 @@
 import json
+import os
 import chromadb
 from pathlib import Path
-from typing import List, Dict, Optional, Union
+from typing import Any, Callable, Iterator, List, Dict, Optional, Set, Tuple, Union
 import logging
-import ollama
+import sqlite3
+import threading
+from collections import OrderedDict
 from config.config import config
+from src.core.embedding_cache import EmbeddingCache
+from src.core.ollama_client import get_client
+
+# Chunk embedding cache, stored next to the Chroma database
+EMBEDDING_CACHE_FILE = "embedding_cache.sqlite3"
+
+# Records which processed JSON each document was last indexed from, stored next to the Chroma database
+INDEX_MANIFEST_FILE = "_indexed.json"
+
+# Number of query embeddings kept in memory for repeated questions
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+# Number of texts sent to Ollama per embedding request
+EMBED_BATCH_SIZE = 64
+
+# Distance used by new Chroma collections: inner product on normalized embeddings
+# (reported distance = 1 - cosine similarity)
+COLLECTION_DISTANCE = "ip"
+
+# Ollama endpoint that produced a collection's vectors, recorded in its metadata; collections built
+# from the legacy /api/embeddings endpoint lack it and are rebuilt on the next indexing run
+EMBEDDING_ENDPOINT = "embed"
+
+# Maximum number of chunks sent to Chroma in a single add() call during ingestion
+BULK_INSERT_BATCH_SIZE = 5000
 
 
 class VectorStore:
@@ -24,6 +52,7 @@ class VectorStore:
         self.db_path = Path(config.vector_store.db_path)
         self.db_path.mkdir(parents=True, exist_ok=True)
         self.embedding_model = config.models.embedding_model
+        self.ollama_client = get_client()
         
         # Initialize logger
         self.logger = logging.getLogger(__name__)
@@ -33,6 +62,28 @@ class VectorStore:
         
         # Store collections for each document
         self.collections = {}
+        self._collections_lock = threading.Lock()
+        # Documents whose existing collection predates EMBEDDING_ENDPOINT (unnormalized, l2 vectors)
+        self._legacy_collections = set()
+        
+        # Chunks per add() call, capped by what the Chroma server accepts in one batch
+        self.bulk_batch_size = BULK_INSERT_BATCH_SIZE
+        try:
+            self.bulk_batch_size = min(self.bulk_batch_size, self.client.get_max_batch_size())
+        except Exception:
+            pass
+        
+        # Embeddings of previously seen chunks, so rebuilds only embed new or changed text
+        try:
+            # Keyed by model and endpoint: vectors from the batch endpoint are normalized
+            self.embedding_cache = EmbeddingCache(self.db_path / EMBEDDING_CACHE_FILE, f"{self.embedding_model}@embed")
+        except sqlite3.Error as e:
+            self.logger.warning("⚠️ Embedding cache unavailable, chunks will always be re-embedded: %s", e)
+            self.embedding_cache = None
+        
+        # Embeddings of recent queries, kept in memory only (least recently used evicted first)
+        self._query_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
         
         # Test Ollama connection
         self._test_ollama_connection()
@@ -48,13 +99,108 @@ class VectorStore:
         Returns:
             List[float]: The embedding vector for the text.
         """
-        try:
-            response = ollama.embeddings(model=self.embedding_model, prompt=text)
-            return response['embedding']
-        except Exception as e:
-            self.logger.error(f"Error generating embedding: {e}")
-            # Return zero vector as fallback
-            return [0.0] * 1024
+        return self._generate_ollama_embeddings([text])[0]
+    
+    def _generate_ollama_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generates embedding vectors for several texts, sending them to Ollama in batches of EMBED_BATCH_SIZE.
+        Uses Ollama's batch embed endpoint, which returns L2-normalized vectors; queries go through
+        the same endpoint so stored and query vectors stay comparable.
+        Returns zero vectors as a fallback for any batch that fails.
+
+        Args:
+            texts (List[str]): The texts to generate embeddings for.
+
+        Returns:
+            List[List[float]]: One embedding vector per text, in the same order.
+        """
+        embeddings = []
+        for start in range(0, len(texts), EMBED_BATCH_SIZE):
+            batch = texts[start:start + EMBED_BATCH_SIZE]
+            try:
+                response = self.ollama_client.embed(model=self.embedding_model, input=batch)
+                embeddings.extend(response['embeddings'])
+            except Exception as e:
+                self.logger.error("Error generating embeddings: %s", e)
+                # Return zero vectors as fallback
+                embeddings.extend([0.0] * 1024 for _ in batch)
+        return embeddings
+    
+    def _embed_chunks(self, chunks: List[str]) -> Tuple[List[List[float]], Set[int]]:
+        """
+        Returns the embeddings of the given chunks, reusing cached vectors and batch-embedding the rest.
+        Newly generated embeddings are added to the cache (failed, zero-vector fallbacks are not).
+
+        Args:
+            chunks (List[str]): The chunk texts to embed.
+
+        Returns:
+            Tuple[List[List[float]], Set[int]]: One embedding per chunk, in the same order, and the
+                positions of the chunks whose embedding failed and fell back to a zero vector.
+        """
+        if self.embedding_cache is None:
+            embeddings = self._generate_ollama_embeddings(chunks)
+            return embeddings, {i for i, embedding in enumerate(embeddings) if not any(embedding)}
+        
+        keys = [self.embedding_cache.key(chunk) for chunk in chunks]
+        cached = self.embedding_cache.get_many(keys)
+        
+        # Embed every distinct missing chunk in one batched request sequence
+        missing = {key: chunk for key, chunk in zip(keys, chunks) if key not in cached}
+        generated = dict(zip(missing, self._generate_ollama_embeddings(list(missing.values()))))
+        new_embeddings = {key: embedding for key, embedding in generated.items() if any(embedding)}
+        
+        embeddings = [cached.get(key) or generated[key] for key in keys]
+        
+        self.embedding_cache.put_many(new_embeddings)
+        if cached:
+            self.logger.info("♻️ Reused %d/%d cached embeddings", len(chunks) - len(new_embeddings), len(chunks))
+        return embeddings, {i for i, embedding in enumerate(embeddings) if not any(embedding)}
+    
+    def embed_query(self, text: str) -> List[float]:
+        """
+        Generates the embedding used to search the vector store for a query.
+
+        Args:
+            text (str): The query text.
+
+        Returns:
+            List[float]: The embedding vector (a zero vector if embedding failed).
+        """
+        return self.embed_queries([text])[0]
+    
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generates search embeddings for several queries in batched requests.
+        Query embeddings are kept in a bounded in-memory LRU rather than the persistent chunk cache,
+        so a repeated question is not re-embedded but users' questions are never written to disk.
+
+        Args:
+            texts (List[str]): The query texts.
+
+        Returns:
+            List[List[float]]: One embedding vector per query, in the same order (zero vectors on failure).
+        """
+        embeddings: Dict[str, List[float]] = {}
+        with self._query_embeddings_lock:
+            for text in texts:
+                if text in self._query_embeddings:
+                    self._query_embeddings.move_to_end(text)
+                    embeddings[text] = self._query_embeddings[text]
+        
+        # Embed every distinct missing query in one batched request sequence
+        missing = list(dict.fromkeys(text for text in texts if text not in embeddings))
+        if missing:
+            generated = dict(zip(missing, self._generate_ollama_embeddings(missing)))
+            embeddings.update(generated)
+            with self._query_embeddings_lock:
+                for text, embedding in generated.items():
+                    # Failed, zero-vector fallbacks are not remembered
+                    if any(embedding):
+                        self._query_embeddings[text] = embedding
+                while len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                    self._query_embeddings.popitem(last=False)
+        return [embeddings[text] for text in texts]
     
     def _test_ollama_connection(self):
         """
@@ -63,10 +209,10 @@ class VectorStore:
         """
         try:
             # Test embedding generation
-            test_response = ollama.embeddings(model=self.embedding_model, prompt="test")
-            self.logger.info(f"✅ Ollama embedding model '{self.embedding_model}' is ready")
+            self.ollama_client.embed(model=self.embedding_model, input="test")
+            self.logger.info("✅ Ollama embedding model '%s' is ready", self.embedding_model)
         except Exception as e:
-            self.logger.warning(f"⚠️ Ollama connection issue: {e}")
+            self.logger.warning("⚠️ Ollama connection issue: %s", e)
             self.logger.info("Make sure Ollama is running: ollama serve")
     
     def chunk_text(self, text: str, chunk_size: int = None, overlap: int = None) -> List[str]: # type: ignore
@@ -82,18 +228,55 @@ class VectorStore:
         Returns:
             List[str]: A list of text chunks.
         """
+        return [chunk for chunk, _ in self._iter_chunks(text, chunk_size, overlap)]
+    
+    def _iter_chunks(self, text: str, chunk_size: int = None, overlap: int = None) -> Iterator[Tuple[str, int]]: # type: ignore
+        """Lazily yields (chunk, word count) pairs for chunk_text, one chunk at a time"""
         chunk_size = chunk_size or config.vector_store.chunk_size
         overlap = overlap or config.vector_store.overlap
         
         words = text.split()
-        chunks = []
         
         for i in range(0, len(words), chunk_size - overlap):
-            chunk = ' '.join(words[i:i + chunk_size])
-            if chunk.strip():
-                chunks.append(chunk.strip())
+            # Joined split() words never carry surrounding whitespace, so no strip is needed
+            chunk_words = words[i:i + chunk_size]
+            yield ' '.join(chunk_words), len(chunk_words)
+    
+    def _iter_document_chunks(self, document_name: str, data: Dict) -> Iterator[Tuple[str, str, Dict]]:
+        """
+        Lazily yields (id, chunk, metadata) for every chunk of a processed document, page by page.
+        Each page's text is released once chunked, so only the current page and batch stay referenced.
+
+        Args:
+            document_name (str): The name of the document.
+            data (Dict): The processed document JSON; its sections are consumed.
+
+        Yields:
+            Tuple[str, str, Dict]: The chunk id, text, and metadata.
+        """
+        # Fields shared by every chunk of the document
+        source = data.get('source', 'unknown')
+        content_type = data.get('content_type', 'menu')
+        language = data.get('language', 'fr')
         
-        return chunks
+        sections = data.pop('sections', [])
+        for i, section in enumerate(sections):
+            sections[i] = None
+            content = section.get('content', '')
+            if not content:
+                continue
+            page = section.get('page', i)
+            
+            for j, (chunk, word_count) in enumerate(self._iter_chunks(content)):
+                yield f"{document_name}_page_{page}_chunk_{j}", chunk, {
+                    "source": source,
+                    "document_name": document_name,
+                    "page": page,
+                    "chunk_index": j,
+                    "word_count": word_count,
+                    "content_type": content_type,
+                    "language": language
+                }
     
     def get_or_create_collection(self, document_name: str):
         """
@@ -112,110 +295,281 @@ class VectorStore:
         if document_name in self.collections:
             return self.collections[document_name]
 
+        # Questions may be answered concurrently; only one thread looks up or creates a given collection
+        with self._collections_lock:
+            if document_name in self.collections:
+                return self.collections[document_name]
+
+            collection_name = config.get_collection_name(document_name)
+
+            try:
+                # Try to get existing collection first
+                collection = self.client.get_collection(name=collection_name)
+                self.logger.info("Using existing collection: %s", collection_name)
+                if (collection.metadata or {}).get("embedding_endpoint") != EMBEDDING_ENDPOINT:
+                    self._legacy_collections.add(document_name)
+                    self.logger.warning("⚠️ Collection %s was built with an older embedding method; search results "
+                                        "stay degraded until it is re-indexed (pizzeria-rag process-all)", collection_name)
+            except Exception:
+                # Collection doesn't exist, create new one
+                collection = self._create_collection(document_name, collection_name)
+
+            self.collections[document_name] = collection
+            return collection
+    
+    def _create_collection(self, document_name: str, collection_name: str):
+        """
+        Creates the ChromaDB collection of a document, recording the embedding endpoint and distance it uses.
+
+        Args:
+            document_name (str): The name of the document.
+            collection_name (str): The Chroma collection name for the document.
+
+        Returns:
+            Any: The new ChromaDB collection.
+
+        Raises:
+            Exception: If the collection cannot be created.
+        """
+        try:
+            doc_config = config.get_document_by_name(document_name)
+            collection = self.client.create_collection(
+                name=collection_name,
+                metadata={
+                    "description": doc_config.description,
+                    "document_name": document_name,
+                    "language": doc_config.language,
+                    "content_type": doc_config.content_type,
+                    "embedding_endpoint": EMBEDDING_ENDPOINT,
+                    # Embeddings are unit-length, so inner product ranks like cosine similarity
+                    # without Chroma normalizing or computing norms per comparison
+                    "hnsw:space": COLLECTION_DISTANCE
+                }
+            )
+            self.logger.info("Created new collection: %s", collection_name)
+            return collection
+        except Exception as e:
+            self.logger.error("Error creating collection: %s", e)
+            raise Exception(f"Could not create or access collection: {e}") from e
+    
+    def _rebuild_legacy_collection(self, document_name: str):
+        """Replaces a document's collection built with the legacy embedding endpoint by an empty, current one"""
         collection_name = config.get_collection_name(document_name)
+        with self._collections_lock:
+            self.client.delete_collection(name=collection_name)
+            self.collections[document_name] = self._create_collection(document_name, collection_name)
+            self._legacy_collections.discard(document_name)
+        self.logger.info("🔄 Rebuilding %s with the current embedding method", collection_name)
+    
+    @property
+    def index_manifest_path(self) -> Path:
+        """Location of the manifest recording the processed JSON each document was indexed from"""
+        return self.db_path / INDEX_MANIFEST_FILE
+    
+    def _load_index_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Loads the index manifest, returning an empty one if it is missing or unreadable"""
+        try:
+            with open(self.index_manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_index_manifest(self, manifest: Dict[str, Dict[str, Any]]):
+        """Atomically writes the index manifest to disk"""
+        try:
+            tmp_path = self.index_manifest_path.with_name(self.index_manifest_path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            tmp_path.replace(self.index_manifest_path)
+        except OSError as e:
+            self.logger.warning("Could not save index manifest: %s", e)
+    
+    def _index_entry(self, json_path: str) -> Dict[str, Any]:
+        """Builds the index manifest entry describing the current state of a processed JSON file"""
+        st = os.stat(json_path)
+        return {
+            "mtime": st.st_mtime,
+            "size": st.st_size,
+            "embedding_model": self.embedding_cache.model if self.embedding_cache else self.embedding_model
+        }
+    
+    def is_indexed(self, document_name: str, manifest: Optional[Dict[str, Dict[str, Any]]] = None) -> bool:
+        """
+        Checks whether a document's collection already holds the current version of its processed JSON.
 
+        Args:
+            document_name (str): The name of the document to check.
+            manifest (Optional[Dict]): An already loaded index manifest, or None to read it from disk.
+
+        Returns:
+            bool: True if the document can be skipped, False if it needs (re)indexing.
+        """
+        if manifest is None:
+            manifest = self._load_index_manifest()
+        entry = manifest.get(document_name)
+        if not entry:
+            return False
         try:
-            # Try to get existing collection first
-            collection = self.client.get_collection(name=collection_name)
-            self.logger.info(f"Using existing collection: {collection_name}")
+            current = self._index_entry(config.get_document_by_name(document_name).processed_json_path)
+            # An emptied or deleted collection, or one built with the legacy embedding endpoint,
+            # needs rebuilding even if the JSON did not change
+            return (entry == current and self.get_or_create_collection(document_name).count() > 0
+                    and document_name not in self._legacy_collections)
         except Exception:
-            # Collection doesn't exist, create new one
-            try:
-                doc_config = config.get_document_by_name(document_name)
-                collection = self.client.create_collection(
-                    name=collection_name,
-                    metadata={
-                        "description": doc_config.description,
-                        "document_name": document_name,
-                        "language": doc_config.language,
-                        "content_type": doc_config.content_type
-                    }
-                )
-                self.logger.info(f"Created new collection: {collection_name}")
-            except Exception as e:
-                self.logger.error(f"Error creating collection: {e}")
-                raise Exception(f"Could not create or access collection: {e}") from e
-
-        self.collections[document_name] = collection
-        return collection
+            return False
     
-    def add_document(self, document_name: str) -> bool:
+    def add_document(self, document_name: str, force: bool = False) -> bool:
         """
         Adds a processed document to the vector store by chunking its content and generating embeddings.
-        Returns True if the document is successfully added, otherwise returns False.
+        Returns True if the document is successfully added (or already indexed), otherwise returns False.
 
         Args:
             document_name (str): The name of the document to add to the vector store.
+            force (bool, optional): Re-index the document even if it is already indexed. Defaults to False.
 
         Returns:
             bool: True if the document is added successfully, False otherwise.
         """
-        try:
-            doc_config = config.get_document_by_name(document_name)
-            json_path = doc_config.processed_json_path
-            
-            if not Path(json_path).exists():
-                self.logger.error(f"Processed JSON not found: {json_path}")
-                return False
-            
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Get collection for this document
-            collection = self.get_or_create_collection(document_name)
-            
-            documents = []
-            metadatas = []
-            ids = []
-            embeddings = []
-            
-            # Process each section (same logic as working simple version)
-            for i, section in enumerate(data.get('sections', [])):
-                content = section.get('content', '')
-                if not content:
+        return self.add_documents([document_name], force=force)[document_name]
+    
+    def add_documents(self, document_names: List[str], force: bool = False) -> Dict[str, bool]:
+        """
+        Adds several processed documents to the vector store, embedding their chunks together.
+        Chunks of all documents share embedding batches, so many small menus cost a few full Ollama
+        requests instead of one partial request each; every document keeps its own collection.
+        Documents already indexed from their current processed JSON are skipped unless force is set.
+
+        Args:
+            document_names (List[str]): The names of the documents to add to the vector store.
+            force (bool, optional): Re-index every document even if already indexed. Defaults to False.
+
+        Returns:
+            Dict[str, bool]: A dictionary with document names as keys and success status as values.
+        """
+        manifest = self._load_index_manifest()
+        skipped = [name for name in document_names if not force and self.is_indexed(name, manifest)]
+        if skipped:
+            self.logger.info("⏭️ %d document(s) already indexed, skipping: %s", len(skipped), ', '.join(skipped))
+        
+        # Source state of each document's JSON, taken before it is read
+        entries: Dict[str, Dict[str, Any]] = {}
+        added = dict.fromkeys(document_names, 0)
+        # Ids written for each document in this run; anything else in its collection is stale
+        written: Dict[str, set] = {name: set() for name in document_names}
+        failed = set()
+        # (document name, chunk id, chunk, metadata) waiting to be embedded and written
+        pending: List[Tuple[str, str, str, Dict]] = []
+        
+        def flush():
+            """
+            Embeds the pending chunks in one go and upserts them into their documents' collections.
+            Chunks whose embedding failed are not written, and their documents are marked failed so
+            they are not recorded as indexed and get re-indexed on the next run.
+            """
+            names = {name for name, _, _, _ in pending}
+            try:
+                embeddings, embedding_failures = self._embed_chunks([chunk for _, _, chunk, _ in pending])
+                if embedding_failures:
+                    self.logger.warning("⚠️ %d chunks could not be embedded; their documents will be re-indexed on the next run",
+                                        len(embedding_failures))
+                by_document: Dict[str, Dict[str, List]] = {}
+                for position, ((name, doc_id, chunk, metadata), embedding) in enumerate(zip(pending, embeddings)):
+                    if position in embedding_failures:
+                        failed.add(name)
+                        continue
+                    batch = by_document.setdefault(name, {"ids": [], "documents": [], "embeddings": [], "metadatas": []})
+                    batch["ids"].append(doc_id)
+                    batch["documents"].append(chunk)
+                    batch["embeddings"].append(embedding)
+                    batch["metadatas"].append(metadata)
+                
+                # Upsert, so a rebuild replaces old vectors
+                for name, batch in by_document.items():
+                    self.collections[name].upsert(**batch)
+                    added[name] += len(batch["ids"])
+                    written[name].update(batch["ids"])
+            except Exception as e:
+                self.logger.error("Error adding documents %s to vector store: %s", ', '.join(sorted(names)), e)
+                failed.update(names)
+            pending.clear()
+        
+        for document_name in document_names:
+            if document_name in skipped:
+                continue
+            try:
+                doc_config = config.get_document_by_name(document_name)
+                json_path = doc_config.processed_json_path
+                
+                try:
+                    entries[document_name] = self._index_entry(json_path)
+                except FileNotFoundError:
+                    self.logger.error("Processed JSON not found: %s", json_path)
+                    failed.add(document_name)
                     continue
                 
-                # Chunk the content
-                chunks = self.chunk_text(content)
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
                 
-                for j, chunk in enumerate(chunks):
-                    doc_id = f"{document_name}_page_{section.get('page', i)}_chunk_{j}"
-                    
-                    # Generate embedding for this chunk
-                    embedding = self._generate_ollama_embedding(chunk)
+                # Get collection for this document
+                self.get_or_create_collection(document_name)
+                if document_name in self._legacy_collections:
+                    self._rebuild_legacy_collection(document_name)
+                
+                # Chunks are produced lazily, page by page (same logic as working simple version)
+                for doc_id, chunk, metadata in self._iter_document_chunks(document_name, data):
+                    pending.append((document_name, doc_id, chunk, metadata))
                     
-                    documents.append(chunk)
-                    embeddings.append(embedding)
-                    metadatas.append({
-                        "source": data.get('source', 'unknown'),
-                        "document_name": document_name,
-                        "page": section.get('page', i),
-                        "chunk_index": j,
-                        "word_count": len(chunk.split()),
-                        "content_type": data.get('content_type', 'menu'),
-                        "language": data.get('language', 'fr')
-                    })
-                    ids.append(doc_id)
-            
-            # Add to collection with manual embeddings
-            if documents and embeddings:
-                collection.add(
-                    documents=documents,
-                    embeddings=embeddings,
-                    metadatas=metadatas,
-                    ids=ids
-                )
-                self.logger.info(f"✅ Added {len(documents)} chunks for {document_name} with Ollama embeddings")
-                return True
-            
-            return False
-            
+                    # Flush full batches so large documents are written in a few bulk
+                    # calls without holding every embedding in memory
+                    if len(pending) >= self.bulk_batch_size:
+                        flush()
+                
+            except Exception as e:
+                self.logger.error("Error adding document %s to vector store: %s", document_name, e)
+                failed.add(document_name)
+        
+        if pending:
+            flush()
+        
+        results = {}
+        for document_name in document_names:
+            if document_name in skipped:
+                results[document_name] = True
+                continue
+            results[document_name] = document_name not in failed and added[document_name] > 0
+            if results[document_name]:
+                self._delete_stale_chunks(document_name, written[document_name])
+                self.logger.info("✅ Added %d chunks for %s with Ollama embeddings", added[document_name], document_name)
+                manifest[document_name] = entries[document_name]
+            else:
+                manifest.pop(document_name, None)
+        
+        if len(skipped) < len(document_names):
+            self._save_index_manifest(manifest)
+        return results
+    
+    def _delete_stale_chunks(self, document_name: str, current_ids: set):
+        """
+        Removes the chunks of a re-indexed document that its new version no longer has (e.g. pages
+        removed or shortened), once the new chunks are written so a failed run keeps the old ones.
+
+        Args:
+            document_name (str): The name of the re-indexed document.
+            current_ids (set): The ids of every chunk written for its current version.
+        """
+        collection = self.collections[document_name]
+        try:
+            stale = [doc_id for doc_id in collection.get(include=[])["ids"] if doc_id not in current_ids]
+            for start in range(0, len(stale), self.bulk_batch_size):
+                collection.delete(ids=stale[start:start + self.bulk_batch_size])
         except Exception as e:
-            self.logger.error(f"Error adding document {document_name} to vector store: {e}")
-            return False
+            self.logger.warning("Could not remove stale chunks of %s: %s", document_name, e)
+            return
+        if stale:
+            self.logger.info("🧹 Removed %d stale chunks from %s", len(stale), document_name)
     
     def search(self, query: str, document_names: Optional[Union[str, List[str]]] = None, 
-               n_results: int = 5) -> Dict:
+               n_results: int = 5, query_embedding: Optional[List[float]] = None) -> Dict:
         """
         Searches the vector store for relevant content matching the query across specified documents.
         Returns a dictionary with the query, searched documents, and a list of the top matching results.
@@ -224,13 +578,15 @@ class VectorStore:
             query (str): The search query to embed and match against the vector store.
             document_names (Optional[Union[str, List[str]]]): Document names to search, or None for all.
             n_results (int): The maximum number of results to return.
+            query_embedding (Optional[List[float]]): The query's embedding if already computed, or None to embed it.
 
         Returns:
             Dict: A dictionary containing the query, searched documents, and search results.
         """
         try:
             # Generate embedding for the query
-            query_embedding = self._generate_ollama_embedding(query)
+            if query_embedding is None:
+                query_embedding = self.embed_query(query)
             
             # Determine which documents to search
             if document_names is None:
@@ -265,7 +621,7 @@ class VectorStore:
                             all_results.append(result)
                 
                 except Exception as e:
-                    self.logger.warning(f"Error searching document {doc_name}: {e}")
+                    self.logger.warning("Error searching document %s: %s", doc_name, e)
                     continue
             
             # Sort all results by distance and limit
@@ -279,7 +635,7 @@ class VectorStore:
             }
             
         except Exception as e:
-            self.logger.error(f"Error searching vector store: {e}")
+            self.logger.error("Error searching vector store: %s", e)
             return {"query": query, "searched_documents": [], "results": []}
     
     def get_stats(self) -> Dict:
@@ -308,33 +664,40 @@ class VectorStore:
                     stats["total_documents"] += count
                     stats["total_collections"] += 1
                 except Exception as e:
-                    self.logger.warning(f"Error getting stats for {doc_name}: {e}")
+                    self.logger.warning("Error getting stats for %s: %s", doc_name, e)
                     stats["collections"][doc_name] = {"document_count": 0, "error": str(e)}
         
         except Exception as e:
-            self.logger.error(f"Error getting overall stats: {e}")
+            self.logger.error("Error getting overall stats: %s", e)
         
         return stats
     
-    def add_all_documents(self) -> Dict[str, bool]:
+    def add_all_documents(self, progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                          force: bool = False) -> Dict[str, bool]:
         """
         Adds all configured documents to the vector store by processing and embedding their content.
+        All documents go through add_documents together, so their chunks share embedding batches.
         Returns a dictionary mapping document names to their addition success status.
 
+        Args:
+            progress_callback (Optional[Callable[[int, int, str], None]], optional): Called with
+                (current, total, name) for each document once they are all added. Defaults to None.
+            force (bool, optional): Re-index documents that are already indexed. Defaults to False.
+
         Returns:
             Dict[str, bool]: A dictionary with document names as keys and success status as values.
         """
-        results = {}
-        
-        for doc_config in config.documents:
-            self.logger.info(f"Adding {doc_config.name} to vector store...")
-            results[doc_config.name] = self.add_document(doc_config.name)
+        document_names = [doc_config.name for doc_config in config.documents]
+        self.logger.info("Adding %d documents to vector store...", len(document_names))
+        results = self.add_documents(document_names, force=force)
+        if progress_callback is not None:
+            for current, document_name in enumerate(document_names, 1):
+                progress_callback(current, len(document_names), document_name)
         
         # Summary
-        successful = sum(bool(success)
-                     for success in results.values())
+        successful = sum(results.values())
         total = len(results)
-        self.logger.info(f"📊 Vector store update complete: {successful}/{total} documents successful")
+        self.logger.info("📊 Vector store update complete: %d/%d documents successful", successful, total)
         
         return results
 